@@ -1,3 +1,4 @@
+from typing import ClassVar
 from xml.etree import ElementTree as ET
 
 ####################################
@@ -132,6 +133,30 @@ class DAOChargen:
         'skins'               : _vanilla_skins,
     }
 
+    # Resource types per extension, first matching substring wins
+    _resource_rules: ClassVar[dict[str, tuple[tuple[str, str], ...]]] = {
+        "mop": (("heads", "_"),),
+        "mmh": (("hairs", "_har_"), ("beards", "_brd_")),
+        "tnt": (
+            ("hair_colors", "_har_"),
+            ("skin_colors", "_skn_"),
+            ("eyes_colors", "_eye_"),
+            ("eyes_makeup_colors", "_mue_"),
+            ("blush_makeup_colors", "_mub_"),
+            ("lip_makeup_colors", "_mul_"),
+            ("brow_stubble_colors", "_stb_"),
+            ("crew_cut_colors", "_stb_"),
+            ("tattoo_colors", "_tat_"),
+        ),
+        "dds": (("tattoos", "uh_tat_"), ("skins", "uh_hed_")),
+    }
+
+    # Vanilla name endings per resource type, used to skip vanilla files
+    _vanilla_endings: ClassVar[dict[str, tuple[str, ...]]] = {
+        resource_type: tuple(item[0] if isinstance(item, tuple) else item for item in item_list)
+        for resource_type, item_list in _vanilla_lists.items()
+    }
+
     @staticmethod
     def build_vanilla_chargen() -> ET.Element:
         morph_config = ET.Element("morph_config")
@@ -212,39 +237,28 @@ class DAOChargen:
     @staticmethod
     def get_resource_type(base_name: str, ext: str) -> str:
         """Check which type of chargen resource the file is."""
-        match_map = {
-            "mop": [("heads", "_")],
-            "mmh": [("hairs", "_har_"), ("beards", "_brd_")],
-            "tnt": [
-                ("hair_colors", "_har_"),
-                ("skin_colors", "_skn_"),
-                ("eyes_colors", "_eye_"),
-                ("eyes_makeup_colors", "_mue_"),
-                ("blush_makeup_colors", "_mub_"),
-                ("lip_makeup_colors", "_mul_"),
-                ("brow_stubble_colors", "_stb_"),
-                ("crew_cut_colors", "_stb_"),
-                ("tattoo_colors", "_tat_"),
-            ],
-            "dds": [("tattoos", "uh_tat_"), ("skins", "uh_hed_")],
-        }
-        resource_type: str = ""
-        for type_name, substr in match_map.get(ext, ()):
-            if not substr in base_name:
-                continue
-            resource_type = type_name
-            break
-        # Filter out if it's already a vanilla file
-        vanilla_list = DAOChargen._vanilla_lists.get(resource_type, ())
-        if vanilla_list and isinstance(vanilla_list[0], tuple):
-            endings = tuple(item[0] for item in vanilla_list)
-        else: endings = tuple(vanilla_list)
-        if base_name.endswith(endings):
-            resource_type = ""
-        return resource_type
+        for resource_type, substr in DAOChargen._resource_rules.get(ext, ()):
+            if substr in base_name:
+                # Filter out if it's already a vanilla file
+                if base_name.endswith(DAOChargen._vanilla_endings[resource_type]):
+                    return ""
+                return resource_type
+        return ""
+
+    @staticmethod
+    def get_resource_blocks(chargenmorph: ET.Element) -> dict[tuple[str, str], ET.Element]:
+        """Index resource blocks by (type, race), race is empty for the type block itself"""
+        races = set(DAOChargen._race_gender_tags.values())
+        blocks: dict[tuple[str, str], ET.Element] = {}
+        for type_block in chargenmorph:
+            blocks[(type_block.tag, "")] = type_block
+            for race_block in type_block:
+                if race_block.tag in races:
+                    blocks[(type_block.tag, race_block.tag)] = race_block
+        return blocks
 
     @staticmethod
-    def add_resource(chargenmorph: ET.Element, file_name: str, resource_type: str) -> None:
+    def add_resource(blocks: dict[tuple[str, str], ET.Element], file_name: str, resource_type: str) -> None:
         """Create resource element and add to resource block"""
         if not resource_type == "heads":
            file_name = file_name.rsplit(".", 1)[0]
@@ -255,10 +269,7 @@ class DAOChargen:
             attrib = {"name" : file_name}
         resource = DAOChargen.build_resource(attrib)
 
-        race = DAOChargen._race_gender_tags.get(file_name[:2])
-        if race:
-            parent = chargenmorph.find(f"{resource_type}/{race}")
-        else:
-            parent = chargenmorph.find(resource_type)
+        race = DAOChargen._race_gender_tags.get(file_name[:2], "")
+        parent = blocks.get((resource_type, race))
         if isinstance(parent, ET.Element): 
-            parent.append(resource)
\ No newline at end of file
+            parent.append(resource)
@@ -1,7 +1,12 @@
+import json
 import mobase
 import os
+import zipfile
 
-from PyQt6.QtWidgets import QInputDialog
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QInputDialog, QProgressDialog
+from typing import Any, Callable
 
 from xml.etree import ElementTree as ET
 
@@ -12,12 +17,15 @@ from .DAOUtils import DAOUtils
 ###################
 class DAOInstall:
 
+    # Mods already flattened by an interrupted flatten_override_dir_all_mods run
+    FLATTEN_JOURNAL = r"plugins\basic_games\games\dao_game\DAO_FlattenJournal.log"
+
     @staticmethod 
     def queue_install_tasks(filetree: mobase.IFileTree) -> dict[str, list[str]]:  
         """Plan the install tasks without modifying the tree.""" 
         install_path_dict: dict[str, list[str]] = {
             'bioware' : [], 'contents' : [], 'dazip' : [],
-            'docs' : [], 'mo2flatten' : [], 'override' : [],
+            "docs" : [], "override" : [],
             }              
         for entry in DAOUtils.walk_tree_dao(filetree):
             path = entry.pathFrom(filetree, '/')
@@ -29,8 +37,6 @@ class DAOInstall:
                 elif lower_path == "mo2unpack/contents":
                     path = "mo2unpack"
                     key = 'contents'
-                elif lower_path == "packages/core/override_mo2flatten":
-                    key = 'mo2flatten'
                 else: continue  
             else:
                 if lower_path.endswith(".dazip.mo2unpack"):
@@ -44,15 +50,43 @@ class DAOInstall:
         return install_path_dict
     
     @staticmethod
-    def execute_install_tasks(install_path_dict: dict[str, list[str]], mod_path: str) -> bool:
+    def queue_tree_override_files(filetree: mobase.IFileTree, mod_path: str) -> list[str]:
+        """Paths of the files the mod itself places directly in packages/core/override."""
+        ovrd_tree = filetree.find("packages/core/override", mobase.IFileTree.FileTypes.DIRECTORY)
+        if not isinstance(ovrd_tree, mobase.IFileTree):
+            return []
+        return [
+            DAOUtils.os_path(mod_path, "packages/core/override", entry.name())
+            for entry in ovrd_tree if not entry.isDir()
+        ]
+
+    # Flatten key of the mod's own (already flattened) override files, ranked above every archive file
+    TREE_FLATTEN_KEY: tuple[bool, list[tuple[int, str | int]]] = (True, [(2, "")])
+
+    @staticmethod
+    def execute_install_tasks(
+        install_path_dict: dict[str, list[str]],
+        mod_path: str,
+        flatten: bool = False,
+        batch: bool = False,
+        tree_files: list[str] | None = None,
+        ) -> bool:
         """Execute the queued install tasks."""
-        install_func_dict = {
-            "bioware"    : DAOInstall.install_bioware,
-            'contents'   : DAOInstall.install_contents,
-            'dazip'      : DAOInstall.install_dazip,
-            'docs'       : DAOInstall.install_docs,
-            'override'   : DAOInstall.install_override,
-            'mo2flatten' : DAOInstall.install_mo2flatten,
+        # Flatten keys of the files written so far, shared so every archive of the mod is ranked as in one flatten
+        ovrd_keys: dict[str, tuple[bool, list[tuple[int, str | int]]] | None] = {}
+        # Loose mod files win over archive files, as when they were merged in after the archives
+        if flatten:
+            for file_path in tree_files or []:
+                ovrd_keys[os.path.normcase(file_path)] = DAOInstall.TREE_FLATTEN_KEY
+        install_func_dict: dict[str, Callable[[list[str]], bool]] = {
+            "bioware"    : lambda paths: DAOInstall.install_each(
+                paths, mod_path, lambda path, mod_path: DAOInstall.install_bioware(path, mod_path, batch)),
+            "contents"   : lambda paths: DAOInstall.install_each(paths, mod_path, DAOInstall.install_contents),
+            "dazip"      : lambda paths: DAOInstall.install_archives(
+                paths, mod_path, lambda path: DAOInstall.plan_dazip(path, mod_path, flatten), batch, ovrd_keys),
+            "docs"       : lambda paths: DAOInstall.install_each(paths, mod_path, DAOInstall.install_docs),
+            "override"   : lambda paths: DAOInstall.install_archives(
+                paths, mod_path, lambda path: DAOInstall.plan_override(path, mod_path, flatten), batch, ovrd_keys),
         }
         result = True
         for key, func in install_func_dict.items():
@@ -60,10 +94,89 @@ class DAOInstall:
             if not paths:
                 continue
             paths.sort(key=DAOUtils.natural_sort_key)
-            for file_path in paths:
-                if not func(file_path, mod_path):
-                    DAOUtils.log_message(f"Failed install task: {func.__name__}({file_path}, {mod_path})")
-                    result = False
+            if not func(paths):
+                result = False
+        return result
+
+    @staticmethod
+    def install_each(paths: list[str], mod_path: str, func: Callable[[str, str], bool]) -> bool:
+        """Run an install task for each path, in order."""
+        result = True
+        for file_path in paths:
+            if not func(file_path, mod_path):
+                DAOUtils.log_message(f"Failed install task: {func.__name__}({file_path}, {mod_path})")
+                result = False
+        return result
+
+    @staticmethod
+    def install_archives(
+        paths: list[str],
+        mod_path: str,
+        planner: Callable[[str], dict[str, Any] | None],
+        batch: bool = False,
+        keys: dict[str, tuple[bool, list[tuple[int, str | int]]] | None] | None = None,
+        max_workers: int = 4,
+        ) -> bool:
+        """Install archives as if one at a time in order, planning them concurrently and writing only the final winners."""
+        keys = {} if keys is None else keys
+        # Planning only reads the archives, so every archive is planned at once
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dao_plan") as pool:
+            archives = list(pool.map(planner, paths))
+        result = True
+        segment: list[dict[str, Any]] = []
+        for file_path, archive in zip(paths, archives, strict=True):
+            if archive is None:
+                DAOUtils.log_message(f"Failed install task: install_archives({file_path}, {mod_path})")
+                result = False
+                continue
+            segment.append(archive)
+            # An OverrideConfig runs before the next archive is written, same as a serial install
+            if archive.get("config_path"):
+                result = DAOInstall.install_archive_segment(segment, mod_path, keys, batch) and result
+                segment = []
+        if segment:
+            result = DAOInstall.install_archive_segment(segment, mod_path, keys, batch) and result
+        return result
+
+    @staticmethod
+    def install_archive_segment(
+        segment: list[dict[str, Any]],
+        mod_path: str,
+        keys: dict[str, tuple[bool, list[tuple[int, str | int]]] | None],
+        batch: bool = False,
+        ) -> bool:
+        """Write the planned archives in one pass, later archives replacing earlier ones unless flattening orders them, then finish each in order."""
+        # Normcased dst -> (dst, archive, member), Manifest.xml is written from the archive when member is None
+        winners: dict[str, tuple[str, dict[str, Any], zipfile.ZipInfo | None]] = {}
+        # keys: normcased dst -> flatten key of its current winner, including earlier segments
+        for archive in segment:
+            for dst, member in archive["plan"].items():
+                key = archive["keys"].get(dst)
+                if not DAOInstall.flatten_replaces(key, keys.get(os.path.normcase(dst))):
+                    continue
+                keys[os.path.normcase(dst)] = key
+                winners[os.path.normcase(dst)] = (dst, archive, member)
+            if archive.get("manifest_path"):
+                keys[os.path.normcase(archive["manifest_path"])] = None
+                winners[os.path.normcase(archive["manifest_path"])] = (archive["manifest_path"], archive, None)
+        plan = {dst: (archive["path"], member) for dst, archive, member in winners.values() if member is not None}
+        label = os.path.basename(segment[0]["path"]) if len(segment) == 1 else f"{len(segment)} archives"
+        if not DAOUtils.extract_from_archives(plan, label):
+            for archive in segment:
+                DAOUtils.log_message(f"Failed install task: install_archives({archive["path"]}, {mod_path})")
+            return False
+        failed: set[str] = set()
+        for dst, archive, member in winners.values():
+            if member is None and not DAOUtils.write_xml_file(dst, archive["manifest"]):
+                failed.add(archive["path"])
+        result = True
+        for archive in segment:
+            if archive.get("config_path") and not DAOInstall.install_override_config(
+                    archive["config_path"], mod_path, batch=batch):
+                failed.add(archive["path"])
+            if archive["path"] in failed or not DAOUtils.remove_file(archive["path"]):
+                DAOUtils.log_message(f"Failed install task: install_archives({archive["path"]}, {mod_path})")
+                result = False
         return result
         
     @staticmethod
@@ -89,16 +202,134 @@ class DAOInstall:
         return DAOUtils.remove_empty_subdirs(ovrds_path)
 
     @staticmethod
-    def flatten_override_dir_all_mods(mods_path: str) -> bool:
-        """Calls flatten_override_dir for all installed mods"""
+    def is_override_flat(mod_dir: str) -> bool:
+        """Check if the mod's override dir holds no subdirs (or does not exist)."""
+        ovrds_path = DAOUtils.os_path(mod_dir, "packages/core/override")
+        try:
+            with os.scandir(ovrds_path) as entries:
+                return not any(entry.is_dir() for entry in entries)
+        except OSError:
+            return True
+
+    @staticmethod
+    def flatten_override_dir_all_mods(mods_path: str, max_workers: int = 8) -> bool:
+        """Calls flatten_override_dir for all installed mods in parallel, resuming an interrupted run."""
         if not os.path.isdir(mods_path):
             return False 
-        for entry in os.listdir(mods_path):
-            mod_dir = DAOUtils.os_path(mods_path, entry)
-            if not DAOInstall.flatten_override_dir(mod_dir):
-                return False
-            DAOUtils.log_message(f"Flattened override for mod : {entry}.")
-        return True
+        journal = DAOUtils.os_path(DAOInstall.FLATTEN_JOURNAL)
+        journaled = {record[1] for record in DAOUtils.read_journal(journal) if record[0] == "F" and len(record) > 1}
+        # Journaled mods may have been reinstalled unflattened since, so only skip those still flat
+        done = {entry for entry in journaled if DAOInstall.is_override_flat(DAOUtils.os_path(mods_path, entry))}
+        mods = [
+            entry for entry in sorted(os.listdir(mods_path), key=DAOUtils.natural_sort_key)
+            if entry not in done and os.path.isdir(DAOUtils.os_path(mods_path, entry))
+        ]
+        if done:
+            DAOUtils.log_message(f"Resuming override flatten, {len(done)} mods already done.")
+        failed: list[str] = []
+        canceled = False
+        progress = QProgressDialog(f"Flattening override for {len(mods)} mods", "Cancel", 0, len(mods))
+        progress.setWindowTitle("Flatten Override:")
+        progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        progress.setAutoClose(True)
+        progress.setMinimumDuration(250)
+        progress.setValue(0)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dao_flatten") as pool:
+            running: dict[Future[bool], str] = {
+                pool.submit(DAOInstall.flatten_override_dir, DAOUtils.os_path(mods_path, entry)): entry
+                for entry in mods
+            }
+            while running:
+                finished, _ = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    entry = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    try:
+                        result = future.result()
+                    except OSError as e:
+                        DAOUtils.log_message(f"Failed to flatten override for mod {entry}: {e}")
+                        result = False
+                    if not result:
+                        failed.append(entry)
+                        continue
+                    # Journal from this thread only, so records never interleave
+                    DAOUtils.append_journal(journal, [["F", entry]])
+                    DAOUtils.log_message(f"Flattened override for mod : {entry}.")
+                if progress.wasCanceled() and not canceled:
+                    DAOUtils.log_message("Override flatten canceled, will resume from the journal.")
+                    canceled = True
+                    for future in running:
+                        future.cancel()
+                progress.setValue(len(mods) - len(running))
+                QApplication.processEvents()
+        progress.close()
+        if failed:
+            DAOUtils.log_message(f"Failed to flatten override for {len(failed)} mods: {", ".join(failed)}")
+            DAOUtils.show_message_box(
+                header = "Flatten Override Incomplete!",
+                message = [
+                    f"Failed to flatten override for {len(failed)} mods:<br>",
+                    "<br>".join(failed[:20]) + ("<br>..." if len(failed) > 20 else ""),
+                    "<br><br>Re-enable flatten_override to retry only these mods.",
+                    "<br>Please see MO2 logs for more info.",
+                ],
+                warning = True,
+            )
+            return False
+        if canceled:
+            return False
+        # Run complete, the next run starts from scratch
+        return DAOUtils.remove_file(journal)
+
+    @staticmethod
+    def plan_archive_install(
+        members: list[zipfile.ZipInfo],
+        root_dir: str,
+        mod_path: str,
+        flatten: bool,
+        ) -> tuple[dict[str, zipfile.ZipInfo], dict[str, tuple[bool, list[tuple[int, str | int]]]]]:
+        """Map the final path of each file under root_dir in an archive to the member written there, plus the flatten key of flattened paths."""
+        ovrd_dir = "packages/core/override/"
+        # Casefolded rel path -> (flatten key, rel path, member), the key is None outside the flattened override dir
+        winners: dict[str, tuple[tuple[bool, list[tuple[int, str | int]]] | None, str, zipfile.ZipInfo]] = {}
+        for member in members:
+            if member.is_dir():
+                continue
+            name = DAOUtils.safe_member_name(member.filename)
+            if not name.casefold().startswith(root_dir):
+                continue
+            rel_path = name[len(root_dir):]
+            key = None
+            # OverrideConfig.xml keeps its package dir until its config step ran, flatten_override_dir moves it after install
+            if flatten and rel_path.casefold().startswith(ovrd_dir) and not rel_path.casefold().endswith("/overrideconfig.xml"):
+                key = DAOInstall.flatten_key(rel_path[len(ovrd_dir):])
+                rel_path = f"{rel_path[:len(ovrd_dir)]}{rel_path.rpartition("/")[2]}"
+            current = winners.get(rel_path.casefold())
+            if current is None or DAOInstall.flatten_replaces(key, current[0]):
+                winners[rel_path.casefold()] = (key, rel_path, member)
+        plan: dict[str, zipfile.ZipInfo] = {}
+        keys: dict[str, tuple[bool, list[tuple[int, str | int]]]] = {}
+        for key, rel_path, member in winners.values():
+            dst = DAOUtils.os_path(mod_path, rel_path)
+            plan[dst] = member
+            if key is not None:
+                keys[dst] = key
+        return plan, keys
+
+    @staticmethod
+    def flatten_key(ovrd_path: str) -> tuple[bool, list[tuple[int, str | int]]]:
+        """Flatten order of a file by its '/' separated path under the override dir."""
+        # Same winner as flatten_override_dir: subdir files replace loose ones, last in natural order wins
+        return ("/" in ovrd_path, DAOUtils.natural_sort_key(ovrd_path.replace("/", os.sep)))
+
+    @staticmethod
+    def flatten_replaces(
+        key: tuple[bool, list[tuple[int, str | int]]] | None,
+        current: tuple[bool, list[tuple[int, str | int]]] | None,
+        ) -> bool:
+        """Whether a file replaces the current one at the same final path: later wins, unless both are flattened."""
+        return key is None or current is None or current <= key
 
     @staticmethod
     def warn_install_failed(mod_name: str) -> None:
@@ -117,44 +348,80 @@ class DAOInstall:
     ## Install .override archives ##
     ################################
     @staticmethod                   
-    def install_bioware(path: str, mod_path: str) -> bool:
+    def install_bioware(path: str, mod_path: str, batch: bool = False) -> bool:
         """Install unpacked .override archives (from DAO-Modmanager)"""
         temp_path = DAOUtils.os_path(mod_path, path)
-        return DAOInstall.install_override_files(temp_path, mod_path)
+        return DAOInstall.install_override_files(temp_path, mod_path, batch)
     
     @staticmethod   
-    def install_override(file_path:str, mod_path: str) -> bool:
-        """Install .override archives (from DAO-Modmanager)"""    
+    def plan_override(file_path:str, mod_path: str, flatten: bool = False) -> dict[str, Any] | None:
+        """Plan a .override archive install without writing anything, None if not valid"""    
         archive_path = DAOUtils.os_path(mod_path, file_path)
-        temp_path = DAOUtils.os_path(mod_path, "mo2unpack")
-        if not DAOUtils.extract_archive(archive_path, temp_path):
-            return False
-        return DAOInstall.install_override_files(temp_path, mod_path)
+        try:
+            with zipfile.ZipFile(archive_path, "r") as zip_ref:
+                plan, keys = DAOInstall.plan_archive_install(zip_ref.infolist(), "bioware/dragon age/", mod_path, flatten)
+        except (OSError, zipfile.BadZipFile) as e:
+            DAOUtils.log_message(f"Failed to install override archive {archive_path}: {e}")
+            return None
+        config_path = DAOInstall.pick_override_config(
+            [dst for dst in plan if os.path.basename(dst).casefold() == "overrideconfig.xml"], archive_path)
+        return {"path": archive_path, "plan": plan, "keys": keys, "config_path": config_path}
         
     @staticmethod   
-    def install_override_files(temp_path: str, mod_path: str) -> bool:
+    def install_override_files(temp_path: str, mod_path: str, batch: bool = False) -> bool:
         """Move contents of BioWare to override dir and check for OverrideConfig.xml """
         src_dir = DAOUtils.os_path(temp_path, "BioWare", "Dragon Age")
-        config_path = ""
+        # Only this package's config, the mod may already hold other packages' configs
+        config_paths: list[str] = []
         for root, _, files in os.walk(src_dir):
             for file in files:
                 if not file.casefold() == "overrideconfig.xml":
                     continue
                 rel_path = os.path.relpath(root, src_dir)
-                config_path = DAOUtils.os_path(mod_path, rel_path, file)
+                config_paths.append(DAOUtils.os_path(mod_path, rel_path, file))
+        config_path = DAOInstall.pick_override_config(config_paths, temp_path)
         if not DAOUtils.merge_dirs(src_dir, mod_path):
             return False
-        if not DAOInstall.install_override_config(config_path, mod_path):
+        # Shared by the option search and action steps
+        index = DAOInstall.index_override_dir(mod_path) if config_path else None
+        if not DAOInstall.install_override_config(config_path, mod_path, index=index, batch=batch):
             return False
         return DAOUtils.remove_dir(temp_path)
+
+    @staticmethod   
+    def pick_override_config(config_paths: list[str], src: str) -> str:
+        """OverrideConfig.xml installed for a package, the last in natural order if it holds several."""
+        if not config_paths:
+            return ""
+        config_paths = sorted(config_paths, key=DAOUtils.natural_sort_key)
+        if len(config_paths) > 1:
+            DAOUtils.log_message(f"Multiple OverrideConfig.xml files in {src}, using: {config_paths[-1]}")
+        return config_paths[-1]
+
+    @staticmethod   
+    def index_override_dir(mod_path: str) -> dict[str, str]:
+        """Index the mod's override dir by casefolded file name, first found wins."""
+        ovrd_path = DAOUtils.os_path(mod_path, "packages", "core", "override")
+        index: dict[str, str] = {}
+        for root, _, files in os.walk(ovrd_path):
+            for file in files:
+                index.setdefault(file.casefold(), DAOUtils.os_path(root, file))
+        return index
         
     @staticmethod   
-    def install_override_config(config_path: str, mod_path: str) -> bool:
+    def install_override_config(
+        config_path: str,
+        mod_path: str,
+        index: dict[str, str] | None = None,
+        batch: bool = False,
+        ) -> bool:
         """Install wizard for OverrideConfig.XML files from DAO-Modmanager"""
         if not config_path:
             return True 
         ovrd_dir = os.path.dirname(config_path)
         ovrd_name = os.path.basename(ovrd_dir)
+        if batch:
+            return DAOInstall.override_config_installer(config_path, mod_path, index, ovrd_name, True)
         run_config = DAOUtils.show_message_box(
             header = f"DAO-Modmanager Support:",
             message = [
@@ -166,7 +433,7 @@ class DAOInstall:
         )
         if not run_config:
             return True
-        return DAOInstall.override_config_installer(config_path, mod_path)
+        return DAOInstall.override_config_installer(config_path, mod_path, index, ovrd_name)
    
     #############################
     ## Install .dazip archives ##
@@ -178,13 +445,26 @@ class DAOInstall:
         return DAOInstall.install_dazip_files(temp_path, mod_path)
 
     @staticmethod                   
-    def install_dazip(path: str, mod_path: str) -> bool:
-        """Perform install tasks on dazip mod packages"""    
+    def plan_dazip(path: str, mod_path: str, flatten: bool = False) -> dict[str, Any] | None:
+        """Plan a dazip mod package install without writing anything, None if not valid"""    
         archive_path = DAOUtils.os_path(mod_path, path)
-        temp_path = DAOUtils.os_path(mod_path, "mo2unpack")
-        if not DAOUtils.extract_archive(archive_path, temp_path):
-            return False
-        return DAOInstall.install_dazip_files(temp_path, mod_path)
+        try:
+            with zipfile.ZipFile(archive_path, "r") as zip_ref:
+                members = zip_ref.infolist()
+                manifest_info = next((m for m in members if m.filename.casefold() == "manifest.xml"), None)
+                if manifest_info is None:
+                    DAOUtils.log_message(f"Failed to install Manifest - File not found in: {archive_path}")
+                    return None
+                parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True, insert_pis=True))
+                manifest = ET.fromstring(zip_ref.read(manifest_info), parser)
+                dst_path = DAOInstall.get_manifest_path(manifest, mod_path, archive_path)
+                if not dst_path:
+                    return None
+                plan, keys = DAOInstall.plan_archive_install(members, "contents/", mod_path, flatten)
+        except (OSError, zipfile.BadZipFile, ET.ParseError) as e:
+            DAOUtils.log_message(f"Failed to install dazip archive {archive_path}: {e}")
+            return None
+        return {"path": archive_path, "plan": plan, "keys": keys, "manifest": manifest, "manifest_path": dst_path}
 
     @staticmethod
     def install_dazip_files(temp_path: str, mod_path:str) -> bool:
@@ -204,6 +484,16 @@ class DAOInstall:
             DAOUtils.log_message(f"Failed to install Manifest - File not found: {src_path}")
             return False
         manifest = ET.parse(src_path).getroot()
+        dst_path = DAOInstall.get_manifest_path(manifest, mod_path, src_path)
+        if not dst_path:
+            return False
+        if not DAOUtils.move_file_overwrite_dirs(src_path, dst_path):
+            return False
+        return DAOUtils.format_xml_file(dst_path)
+
+    @staticmethod
+    def get_manifest_path(manifest: ET.Element, mod_path: str, src_path: str) -> str:
+        """Install path of Manifest.xml (<Type>s/<uid>/Manifest.xml), empty if not valid."""
         type = manifest.get("Type", "")
         if type.casefold() == "addin":
             tag = "AddInsList/AddInItem"
@@ -211,16 +501,13 @@ class DAOInstall:
             tag = "OfferList/OfferItem"
         else:
             DAOUtils.log_message(f"Failed to install Manifest - No valid Type: {src_path}")
-            return False
+            return ""
         item = manifest.find(tag)
-        uid = item.get("UID", "") if item else ""
+        uid = item.get("UID", "") if item is not None else ""
         if not uid:
             DAOUtils.log_message(f"Failed to install Manifest - No UID found: {src_path}")
-            return False
-        dst_path = DAOUtils.os_path(mod_path, f"{type}s", uid, "Manifest.xml")
-        if not DAOUtils.move_file_overwrite_dirs(src_path, dst_path):
-            return False
-        return DAOUtils.format_xml_file(dst_path)
+            return ""
+        return DAOUtils.os_path(mod_path, f"{type}s", uid, "Manifest.xml")
     
     @staticmethod
     def convert_to_zip(src: str) -> bool:
@@ -246,18 +533,6 @@ class DAOInstall:
         dst_file = DAOUtils.os_path(mod_path, f"{path.replace("docs", f"docs/{mod_name}")}")
         return DAOUtils.move_file_overwrite_dirs(src_file, dst_file)
 
-
-    ########################
-    ## Install mo2flatten ##
-    ########################
-    @staticmethod
-    def install_mo2flatten(path: str, mod_path: str) -> bool:
-        """Renames temp dir packages/core/override_mo2flatten to packages/core/override"""
-        src_dir = DAOUtils.os_path(mod_path, path)
-        if not os.path.exists(src_dir):
-            return False
-        dst_dir = DAOUtils.os_path(mod_path, "packages/core/override")
-        return DAOUtils.merge_dirs(src_dir, dst_dir)
         
     ###################################################
     ### DAO Mod Manager - Override Config Installer ###
@@ -266,23 +541,43 @@ class DAOInstall:
     # This is support for the DAO-Modmanager format of OverrideConfig.XML
     # Allows for choosing optional variations during install of .override package files.
     # https://www.nexusmods.com/dragonage/mods/277
+
+    # Saved selections, keyed by casefolded override package name -> {"<section> - <key>": value}
+    OVERRIDE_PRESETS = r"plugins\basic_games\games\dao_game\DAO_OverridePresets.json"
+
     @staticmethod   
-    def override_config_installer(xml_path: str, mod_path: str) -> bool:
-        """Run override-config installer with user input"""
-        DAOUtils.log_message(f"Running override-config installer.")
+    def override_config_installer(
+        xml_path: str,
+        mod_path: str,
+        index: dict[str, str] | None = None,
+        ovrd_name: str = "",
+        batch: bool = False,
+        ) -> bool:
+        """Run override-config installer with user input, or unattended from saved presets"""
+        DAOUtils.log_message(f"Running override-config installer{" (batch)" if batch else ""}.")
         root = ET.parse(xml_path).getroot()
 
         options = DAOInstall.override_config_parse(root)
         if not options:
             return False
 
-        results = DAOInstall.override_config_dialog(options)
+        presets = DAOInstall.read_override_presets()
+        preset = presets.get(ovrd_name.casefold(), {})
+        if batch:
+            results = DAOInstall.override_config_batch(options, preset)
+        else:
+            results = DAOInstall.override_config_dialog(options, preset)
         if not results:
             return False
 
-        if not DAOInstall.override_config_action(results, mod_path):
+        if not DAOInstall.override_config_action(results, mod_path, index):
             DAOUtils.log_message(f"Failed override-config install.")
             return False
+
+        if ovrd_name:
+            preset.update({res["option"]: res["value"] for res in results})
+            presets[ovrd_name.casefold()] = preset
+            DAOInstall.write_override_presets(presets)
         
         #DAOUtils.remove_file(xml_path) # Remove OverrideConfig.XML once done?
         DAOUtils.log_message(f"Override-config install complete.")
@@ -320,8 +615,55 @@ class DAOInstall:
         return options
     
     @staticmethod   
-    def override_config_dialog(options: list[dict[str,list[str]]]) -> list[dict[str, str]]:
-        """Prompt the user to select from the list of options""" 
+    def read_override_presets() -> dict[str, dict[str, str]]:
+        """Read the saved override-config selections"""
+        preset_path = DAOUtils.os_path(DAOInstall.OVERRIDE_PRESETS)
+        if not DAOUtils.file_exists(preset_path):
+            return {}
+        try:
+            return json.loads(DAOUtils.read_file(preset_path))
+        except (OSError, ValueError) as e:
+            DAOUtils.log_message(f"Failed to read override-config presets {preset_path}: {e}")
+            return {}
+
+    @staticmethod   
+    def write_override_presets(presets: dict[str, dict[str, str]]) -> bool:
+        """Save the override-config selections"""
+        preset_path = DAOUtils.os_path(DAOInstall.OVERRIDE_PRESETS)
+        return DAOUtils.write_file_bytes(preset_path, json.dumps(presets, indent=1, sort_keys=True).encode("utf-8"))
+
+    @staticmethod   
+    def override_config_choice(option: dict[str,list[str]], preset: dict[str, str]) -> int:
+        """Index of the saved value for an option, else of its default value"""
+        saved = preset.get(f"{option['section_name'][0]} - {option['key_name'][0]}")
+        for value in (saved, option["key_default"][0]):
+            if value in option["value_names"]:
+                return option["value_names"].index(value)
+        return 0
+
+    @staticmethod   
+    def override_config_result(option: dict[str,list[str]], i: int) -> dict[str, str]:
+        """Files to swap for the chosen value of an option"""
+        name = f"{option['section_name'][0]} - {option['key_name'][0]}"
+        DAOUtils.log_message(f"{name}: {option['value_names'][i]}")
+        return {
+            "old"    : option["key_file"][0],
+            "new"    : option["value_files"][i],
+            "option" : name,
+            "value"  : option["value_names"][i],
+        }
+
+    @staticmethod   
+    def override_config_batch(options: list[dict[str,list[str]]], preset: dict[str, str]) -> list[dict[str, str]]:
+        """Select the saved or default value of every option, without prompting""" 
+        return [
+            DAOInstall.override_config_result(option, DAOInstall.override_config_choice(option, preset))
+            for option in options if option["value_names"]
+        ]
+
+    @staticmethod   
+    def override_config_dialog(options: list[dict[str,list[str]]], preset: dict[str, str] | None = None) -> list[dict[str, str]]:
+        """Prompt the user to select from the list of options, preselecting saved values""" 
         results: list[dict[str, str]] = []
 
         for option in options:
@@ -336,45 +678,36 @@ class DAOInstall:
                     f"\n{option['description'][0] or ""}"
                 ),
                 option['value_names'],
-                next((i for i, v in enumerate(option['value_names']) if v == option['key_default'][0]), 0),
+                DAOInstall.override_config_choice(option, preset or {}),
                 False
             )
             if not ok:
                 continue
-            old = option['key_file'][0]
             i = next((i for i, v in enumerate(option['value_names']) if v == item), 0)
-            new = option['value_files'][i]
-            DAOUtils.log_message(f"{option['section_name'][0]} - {option['key_name'][0]}: {option['value_names'][i]}")
-            res = {
-                'old' : old,
-                'new' : new,
-            }
-            results.append(res)
+            results.append(DAOInstall.override_config_result(option, i))
         return results
     
     @staticmethod   
-    def override_config_action(results: list[dict[str, str]], mod_path: str) -> bool:
+    def override_config_action(results: list[dict[str, str]], mod_path: str, index: dict[str, str] | None = None) -> bool:
         """Move files based on the user selections"""
-        ovrd_path = DAOUtils.os_path(mod_path, "packages", "core", "override")
+        if index is None:
+            index = DAOInstall.index_override_dir(mod_path)
         for res in results:
             new = res['new']
             old = res['old']
-            src_path = DAOInstall.override_config_search(new, ovrd_path)
-            dst_path = DAOInstall.override_config_search(old, ovrd_path)
+            src_path = DAOInstall.override_config_search(new, index)
+            dst_path = DAOInstall.override_config_search(old, index)
+            # Choosing the original file leaves it in place
+            if src_path and src_path.casefold() == dst_path.casefold():
+                continue
             if not DAOUtils.copy_file(src_path, dst_path):
                 return False
         return True
 
     @staticmethod   
-    def override_config_search(file_name: str, ovrd_path: str) -> str:
+    def override_config_search(file_name: str, index: dict[str, str]) -> str:
         """Find the full path of the override file"""
-        for root, _, files in os.walk(ovrd_path):
-            for file in files:
-                if not file.casefold() == file_name.casefold():
-                    continue
-                rel_path = os.path.relpath(root, ovrd_path)
-                return DAOUtils.os_path(ovrd_path, rel_path, file)
-        return ""
+        return index.get(file_name.casefold(), "")
 
     ###########
     ## FOMOD ##
@@ -382,40 +715,78 @@ class DAOInstall:
     
     DAO_FOMOD_PATH = r"plugins\basic_games\games\dao_game\DAO_FOMOD"
 
+    # A checksum file holds the sha256, followed by the archive size in bytes once a download has matched it
+    # A checksum file holds the sha256, optionally followed by the archive size in bytes
+    _fomod_registry: dict[str, tuple[str, int | None]] | None = None
+
+    @staticmethod
+    def get_fomod_registry() -> dict[str, tuple[str, int | None]]:
+        """Index every DAO_FOMOD/<name>/checksum by digest, loaded once."""
+        if DAOInstall._fomod_registry is not None:
+            return DAOInstall._fomod_registry
+        registry: dict[str, tuple[str, int | None]] = {}
+        try:
+            with os.scandir(DAOInstall.DAO_FOMOD_PATH) as entries:
+                script_dirs = [entry.path for entry in entries if entry.is_dir()]
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to load FOMOD scripts: {e}")
+            script_dirs = []
+        for script_dir in script_dirs:
+            checksum_path = DAOUtils.os_path(script_dir, "checksum")
+            if not DAOUtils.file_exists(checksum_path):
+                continue
+            fields = DAOUtils.read_file(checksum_path).split()
+            if not fields:
+                continue
+            size = int(fields[1]) if len(fields) > 1 and fields[1].isdigit() else None
+            registry[fields[0].casefold()] = (script_dir, size)
+        DAOUtils.log_message(f"Loaded {len(registry)} FOMOD scripts.")
+        DAOInstall._fomod_registry = registry
+        return registry
+
     @staticmethod
     def check_fomod_script(path: str, name: str) -> bool:
-        """Check if a matching FOMOD script exists"""
-        script_dir = f"{DAOInstall.DAO_FOMOD_PATH}\\{name}"
-        if not os.path.exists(script_dir):
+        """Check if a matching FOMOD script exists, by archive digest"""
+        registry = DAOInstall.get_fomod_registry()
+        if not registry or not DAOUtils.file_exists(path):
             return True
-        checksum = DAOUtils.read_file(f"{script_dir}/checksum")
-        if not DAOUtils.validate_checksum(path, checksum):
+        # Only hash downloads a script can belong to: same name, same recorded size, or a script with no size yet
+        size = os.path.getsize(path)
+        if not any(
+            entry_size is None or entry_size == size or os.path.basename(script_dir).casefold() == name.casefold()
+            for script_dir, entry_size in registry.values()
+        ):
             return True
-        DAOUtils.log_message(f"Adding FOMOD script to: {name}")
+        digest = DAOUtils.hash_file(path, "sha256")
+        script_dir, entry_size = registry.get(digest, ("", None))
+        if not script_dir:
+            return True
+        script_name = os.path.basename(script_dir)
+        if script_name.casefold() != name.casefold():
+            DAOUtils.log_message(f"Matched FOMOD script {script_name} by checksum to renamed download: {name}")
+        if entry_size is None:
+            DAOInstall.record_fomod_size(script_dir, digest, size)
+        DAOUtils.log_message(f"Adding FOMOD script to: {name} ({script_name})")
         if DAOInstall.repackage_with_fomod(path, script_dir):
             DAOUtils.log_message(f"Done.")
             return True
         DAOUtils.log_message(f"C'est un désastre, non?")
         return False
 
+    @staticmethod
+    def record_fomod_size(script_dir: str, digest: str, size: int) -> None:
+        """Save the archive size to the script's checksum, so later downloads are only hashed on a size match."""
+        checksum_path = DAOUtils.os_path(script_dir, "checksum")
+        if DAOUtils.write_file_bytes(checksum_path, f"{digest} {size}\n".encode()):
+            DAOInstall.get_fomod_registry()[digest] = (script_dir, size)
+
     @staticmethod
     def repackage_with_fomod(path: str, script_dir: str) -> bool:
-        """Repackage archive with FOMOD scripts inside"""
-        # Extract  
-        parent = os.path.dirname(path)
-        temp = DAOUtils.os_path(parent, "temp")
-        fomod = DAOUtils.os_path(temp, "fomod")
-        if not (DAOUtils.make_dirs(fomod) and DAOUtils.extract_archive(path, temp, False)):
-            DAOUtils.remove_dir(temp)
-            return False
-        # Copy FOMOD scripts
-        info = DAOUtils.os_path(script_dir, "info.xml")
-        config = DAOUtils.os_path(script_dir, "ModuleConfig.xml")
-        if not (DAOUtils.copy_file(info, fomod) and DAOUtils.copy_file(config, fomod)):
-            DAOUtils.remove_dir(temp)
-            return False        
-        # Re-zip
-        if DAOUtils.create_archive(temp, path, True):
+        """Add FOMOD scripts to the archive in place"""
+        files = {
+            "fomod/info.xml"         : DAOUtils.os_path(script_dir, "info.xml"),
+            "fomod/ModuleConfig.xml" : DAOUtils.os_path(script_dir, "ModuleConfig.xml"),
+        }
+        if DAOUtils.append_to_archive(path, files):
             return DAOInstall.convert_to_zip(path)
-        DAOUtils.remove_dir(temp)
         return False
\ No newline at end of file
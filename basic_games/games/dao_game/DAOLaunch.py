@@ -1,6 +1,9 @@
+import copy
 import mobase
 import os
+import time
 
+from typing import Any, ClassVar
 from xml.etree import ElementTree as ET
 
 from .DAOChargen import DAOChargen
@@ -15,19 +18,37 @@ class DAOLaunch:
     ### Move bin_ship files to game root ###
     ########################################
 
-    SECONDARY_DIR_BACKUP = r"plugins\basic_games\games\dao_game\DAO_BinList.xml"
+    # Append-only journal of deploy operations, replayed for recovery:
+    # S <start_ns> <app_path>    - game session started
+    # B <dir> <path>             - about to back up an existing game file
+    # D <dir> <path> <src> <size> <mtime> <hash> <backup> - about to deploy a file
+    # R <dir> <path>             - deployed file removed (and backup restored)
+    # E                          - game session ended
+    SECONDARY_JOURNAL = r"plugins\basic_games\games\dao_game\DAO_BinJournal.log"
 
     _secondary_dirs = {
     "bin_ship" : ("game_dir", "bin_ship"),
     }
 
+    # Only binaries are linked, configs (e.g. DAFix.ini) are copied so in-place edits never reach the mod's file
+    _link_extensions = frozenset({"asi", "dll", "exe"})
+
     @staticmethod
-    def deploy_secondary_files(app_path: str, path_dict: dict[str, str], organizer: mobase.IOrganizer) -> bool:
-        """Move files to secondary dirs"""
-        # Backup snapshot of each secondary dir
-        if not DAOLaunch._save_secondary_dir_list(app_path, path_dict):
+    def deploy_secondary_files(
+        app_path: str, path_dict: dict[str, str],
+        sources: dict[str, dict[str, tuple[str, str]]], link: bool = True,
+        ) -> bool:
+        """Deploy files to secondary dirs (sources from get_secondary_sources), only touching files changed since the last deployment"""
+        # Start a new session, compacting the journal down to what is still deployed
+        state = DAOLaunch._replay_journal()
+        deployed_dirs = state["deployed"]
+        records = [["S", str(time.time_ns()), app_path]]
+        for key, deployed in deployed_dirs.items():
+            records.extend(DAOLaunch._deploy_record(key, entry) for entry in deployed.values())
+        if not DAOUtils.write_journal(DAOLaunch._get_journal_path(), records):
+            DAOUtils.log_message("Failed to start secondary dir journal.")
             return False
-        # Move data files to deploy dirs
+        # Deploy data files to deploy dirs
         dir_dict = DAOLaunch._get_secondary_dirs()
         for key, value in dir_dict.items():
             deploy_dir = DAOLaunch._get_deploy_dir(path_dict, value)
@@ -35,29 +56,49 @@ class DAOLaunch:
                 DAOUtils.log_message(f"No matching dir found for: {value}.")
                 continue
             DAOUtils.log_message(f"Deploying {key} files to: {deploy_dir}")
-            if not DAOLaunch._move_secondary_files(key, deploy_dir, organizer, True):
-                return False      
+            deployed = deployed_dirs.setdefault(key, {})
+            if not DAOLaunch._deploy_secondary_files(key, deploy_dir, sources.get(key, {}), deployed, link):
+                return False
         return True
 
     @staticmethod
-    def recover_secondary_dirs(app_path: str, path_dict: dict[str, str], organizer: mobase.IOrganizer) -> bool:
+    def get_secondary_sources(organizer: mobase.IOrganizer) -> dict[str, dict[str, tuple[str, str]]]:
+        """Files each secondary dir should hold -> {casefolded rel path: (rel path, real path)}, resolved on the UI thread"""
+        sources: dict[str, dict[str, tuple[str, str]]] = {}
+        vfs_tree = organizer.virtualFileTree()
+        for dir_name in DAOLaunch._get_secondary_dirs():
+            wanted = sources[dir_name] = {}
+            dir_tree = vfs_tree.find(dir_name, mobase.IFileTree.FileTypes.DIRECTORY)
+            if not isinstance(dir_tree, mobase.IFileTree):
+                continue
+            for entry in DAOUtils.walk_tree_dao(dir_tree):
+                if entry.isDir():
+                    continue
+                file_path = entry.pathFrom(vfs_tree)
+                rel_path = DAOUtils.os_path(os.path.relpath(file_path, dir_name))
+                wanted[rel_path.casefold()] = (rel_path, DAOUtils.os_path(DAOUtils.resolve_path(organizer, file_path)))
+        return sources
+
+    @staticmethod
+    def recover_secondary_dirs(app_path: str, path_dict: dict[str, str], keep_deployed: bool = False) -> bool:
         """Recover secondary dirs to original state"""
-        # Read in snapshot of each secondary dir
-        data = DAOLaunch._read_secondary_dir_list()
-        if data is None:
+        # Replay the journal of this session
+        state = DAOLaunch._replay_journal()
+        if not state["open"]:
+            DAOUtils.log_message("Warning: No open session in secondary dir journal.")
             return False
-        app_path_bak = data.get("app_path", "")
-        if isinstance(app_path_bak, list) or app_path_bak.casefold() != app_path.casefold():
-            DAOUtils.log_message(f"Warning: Backup does not match app: {app_path}")
+        if state["app_path"].casefold() != app_path.casefold():
+            DAOUtils.log_message(f"Warning: Journal does not match app: {app_path}")
             return False
-        return DAOLaunch._restore_secondary_files(data, path_dict, organizer)
+        return DAOLaunch._restore_secondary_files(state, path_dict, keep_deployed)
 
     @staticmethod
-    def check_secondary_status( path_dict: dict[str, str], organizer: mobase.IOrganizer) -> bool:
+    def check_secondary_status(path_dict: dict[str, str], keep_deployed: bool = False) -> bool:
         """Check if secondary dir recovery was incomplete."""
-        # Detect and recover bin list
-        backup_path = DAOLaunch._get_backup_path()
-        if not DAOUtils.file_exists(backup_path):
+        # Detect an unfinished session in the journal
+        journal_path = DAOLaunch._get_journal_path()
+        state = DAOLaunch._replay_journal()
+        if not state["open"]:
             return True
         DAOUtils.log_message(f"Warning: Mod Organizer 2 may have crashed while game was running.")
         DAOUtils.show_message_box(
@@ -65,48 +106,77 @@ class DAOLaunch:
             message = [
                 f"Mod Organizer 2 may have shutdown during gameplay!<br><br>",
                 "Please check bin_ship dir.<br><br>",
-                f"Backup file: {backup_path}.<br><br>",
+                f"Journal file: {journal_path}.<br><br>",
             ],
             link = f"file:///{path_dict["game_dir"]}/bin_ship",
             link_name = "-- bin_ship Directory --",            
             warning = True,
             )
-        # Read in snapshot of each secondary dir
-        data = DAOLaunch._read_secondary_dir_list()
-        if data is None:
-            return False
-        return DAOLaunch._restore_secondary_files(data, path_dict, organizer)
+        return DAOLaunch._restore_secondary_files(state, path_dict, keep_deployed)
+
+    @staticmethod
+    def undeploy_secondary_files(path_dict: dict[str, str]) -> bool:
+        """Remove a deployment left in place between runs"""
+        journal_path = DAOLaunch._get_journal_path()
+        if not DAOUtils.file_exists(journal_path):
+            return True
+        DAOUtils.log_message("Removing deployed secondary files.")
+        state = DAOLaunch._replay_journal()
+        dir_dict = DAOLaunch._get_secondary_dirs()
+        for key, value in dir_dict.items():
+            deploy_dir = DAOLaunch._get_deploy_dir(path_dict, value)
+            deployed = state["deployed"].get(key, {})
+            if deploy_dir is None or not deployed:
+                continue
+            if not DAOLaunch._undeploy_secondary_files(key, deploy_dir, deployed):
+                return False
+        return DAOUtils.remove_file(journal_path)
       
     @staticmethod
-    def _restore_secondary_files(data: dict[str, str | list[str]], path_dict: dict[str, str], organizer: mobase.IOrganizer) -> bool:
+    def _restore_secondary_files(state: dict[str, Any], path_dict: dict[str, str], keep_deployed: bool) -> bool:
         """Restore files in secondary dirs"""
-        backup_path = DAOLaunch._get_backup_path()
+        journal_path = DAOLaunch._get_journal_path()
+        deployed_dirs: dict[str, dict[str, dict[str, str]]] = state["deployed"]
         # Restore data files in deploy dirs
         dir_dict = DAOLaunch._get_secondary_dirs()
         for key, value in dir_dict.items():
             deploy_dir = DAOLaunch._get_deploy_dir(path_dict, value)
             if deploy_dir is None:
                 continue
-            if DAOLaunch._move_secondary_files(key, deploy_dir, organizer, False):
-                file_list_bak = set(data.get(key, []))
-                overwrite = organizer.overwritePath()
-                if DAOLaunch._clean_secondary_dir(key, deploy_dir, file_list_bak, overwrite):
+            deployed = deployed_dirs.get(key, {})
+            restored: set[str] = state["restored"].get(key, set())
+            overwrite = path_dict["overwrite"]
+            if DAOLaunch._clean_secondary_dir(key, deploy_dir, deployed, restored, state["start"], overwrite):
+                if keep_deployed or DAOLaunch._undeploy_secondary_files(key, deploy_dir, deployed):
                     continue
             DAOUtils.log_message(f"Warning: Failed to restore secondary dirs! Please see logs.")
             return False
-        # Remove snapshot of each secondary dir
-        if not DAOUtils.remove_file(backup_path):
-            DAOUtils.log_message(f"Warning: Failed to remove secondary dir list file: {backup_path}.")
+        # Close the session, keeping the journal only while files remain deployed
+        if any(deployed_dirs.values()):
+            return DAOUtils.append_journal(journal_path, [["E"]])
+        if not DAOUtils.remove_file(journal_path):
+            DAOUtils.log_message(f"Warning: Failed to remove secondary dir journal: {journal_path}.")
             return False        
         return True 
 
     @staticmethod
-    def _clean_secondary_dir(dir_name: str, deploy_dir: str, file_list_bak: set[str], overwrite: str) -> bool:
-        """Remove any untracked files from secondary dir."""      
-        file_list = DAOUtils.list_files(deploy_dir)
-        file_paths = file_list - file_list_bak
-        for path in file_paths:
+    def _clean_secondary_dir(
+        dir_name: str, deploy_dir: str, deployed: dict[str, dict[str, str]],
+        restored: set[str], since: int, overwrite: str,
+        ) -> bool:
+        """Remove any untracked files created in secondary dir since the session started."""      
+        tracked: set[str] = set(restored)
+        for entry in deployed.values():
+            tracked.add(DAOUtils.os_path_casefold(entry["path"]))
+            if entry.get("backup") == "1":
+                tracked.add(DAOUtils.os_path_casefold(f"{entry["path"]}.mohidden"))
+        for path in DAOUtils.list_files(deploy_dir):
+            if path.casefold() in tracked:
+                continue
             src_path = DAOUtils.os_path(deploy_dir, path)
+            birthtime = DAOUtils.get_file_birthtime(src_path)
+            if birthtime is None or birthtime < since:
+                continue
             dst_path = DAOUtils.os_path(overwrite, dir_name, path)
             if not DAOUtils.move_file_overwrite_dirs(src_path, dst_path):
                 return False
@@ -117,46 +187,8 @@ class DAOLaunch:
         return DAOLaunch._secondary_dirs
     
     @staticmethod
-    def _save_secondary_dir_list(app_path: str, path_dict: dict[str, str]) -> bool:
-        """Save secondary dirs list to xml"""
-        backup_path = DAOLaunch._get_backup_path()
-        data: dict[str, str | list[str]] = {"app_path": app_path}
-        dir_dict = DAOLaunch._get_secondary_dirs()
-        for key, value in dir_dict.items():
-            deploy_path = DAOLaunch._get_deploy_dir(path_dict, value)
-            if deploy_path is None:
-                continue
-            file_list = DAOUtils.list_files(deploy_path)
-            data[key] = list(file_list)
-        if not DAOLaunch._write_backup_xml(backup_path, data):
-            DAOUtils.log_message(f"Failed to save secondary dir backup to {backup_path}.")
-            return False
-        return True
-
-    @staticmethod
-    def _read_secondary_dir_list() -> dict[str, str | list[str]] | None:
-        """Read in the saved dir list from xml"""
-        backup_path = DAOLaunch._get_backup_path()           
-        root = DAOUtils.read_file_xml(backup_path)
-        if root is None:
-            DAOUtils.log_message(f"Warning: Failed to read secondary dir backup: {backup_path}")
-            return None
-        app_path = root.findtext("app_path")
-        if app_path is None:
-            DAOUtils.log_message(f"Warning: App path missing from secondary dir backup: {backup_path}")
-            return None
-        data: dict[str, str | list[str]] = {"app_path": app_path}
-        for dir_elem in root:
-            key = dir_elem.tag
-            if key == "app_path":
-                continue
-            file_list = [f.text for f in dir_elem.findall("file") if f.text]
-            data[key] = file_list
-        return data 
-    
-    @staticmethod
-    def _get_backup_path() -> str:
-        return DAOUtils.os_path(DAOLaunch.SECONDARY_DIR_BACKUP)
+    def _get_journal_path() -> str:
+        return DAOUtils.os_path(DAOLaunch.SECONDARY_JOURNAL)
 
     @staticmethod
     def _get_deploy_dir(path_dict: dict[str, str], value: tuple[str, str]) -> str | None:
@@ -169,121 +201,243 @@ class DAOLaunch:
         return deploy_path
 
     @staticmethod
-    def _write_backup_xml(path: str, data: dict[str, str | list[str]]) -> bool:
-        """Write a secondary backup to XML."""
-        root = ET.Element("SecondaryDirs")
-        for key, value in data.items():
-            elem = ET.SubElement(root, key)
-            # app_path
-            if isinstance(value, str):
-                elem.text = value
-                continue
-            # secondary dirs
-            for item in value:
-                file_elem = ET.SubElement(elem, "file")
-                file_elem.text = item
-        xml_str = ET.tostring(root, encoding="unicode")
-        xml_bytes = DAOUtils.pretty_format_xml(xml_str)
-        return DAOUtils.write_file_bytes(path, xml_bytes)
+    def _replay_journal() -> dict[str, Any]:
+        """Rebuild deploy state from the journal: last session and dir -> casefolded path -> file entry"""
+        state: dict[str, Any] = {"app_path": "", "start": 0, "open": False, "deployed": {}, "restored": {}}
+        deployed_dirs: dict[str, dict[str, dict[str, str]]] = state["deployed"]
+        # Paths restored during the last session are game files, not untracked ones
+        restored_dirs: dict[str, set[str]] = state["restored"]
+        for record in DAOUtils.read_journal(DAOLaunch._get_journal_path()):
+            match record:
+                case ["S", start, app_path] if start.isdigit():
+                    state.update(app_path = app_path, start = int(start), open = True)
+                    restored_dirs.clear()
+                case ["E"]:
+                    state["open"] = False
+                case ["B", key, path]:
+                    deployed = deployed_dirs.setdefault(key, {})
+                    deployed[path.casefold()] = {"path": path, "backup": "1"}
+                case ["D", key, path, src, size, mtime, file_hash, backup]:
+                    deployed = deployed_dirs.setdefault(key, {})
+                    deployed[path.casefold()] = {
+                        "path": path, "src": src, "size": size,
+                        "mtime": mtime, "hash": file_hash, "backup": backup,
+                        }
+                case ["R", key, path]:
+                    deployed_dirs.get(key, {}).pop(path.casefold(), None)
+                    restored_dirs.setdefault(key, set()).add(DAOUtils.os_path_casefold(path))
+                case _:
+                    DAOUtils.log_message(f"Skipping invalid journal record: {record}")
+        return state
+
+    @staticmethod
+    def _deploy_record(key: str, entry: dict[str, str]) -> list[str]:
+        """Journal record for a deployed file"""
+        if "src" not in entry:
+            return ["B", key, entry["path"]]
+        return [
+            "D", key, entry["path"], entry["src"], entry["size"],
+            entry["mtime"], entry["hash"], entry["backup"],
+            ]
     
     @staticmethod
-    def _move_secondary_files(dir_name: str, deploy_dir: str, organizer: mobase.IOrganizer, deploy: bool) -> bool:
-        """Move files to and from deploy dir"""
-        vfs_tree = organizer.virtualFileTree()
-        dir_tree = vfs_tree.find(dir_name, mobase.IFileTree.FileTypes.DIRECTORY)
-        if not isinstance(dir_tree, mobase.IFileTree):
-            return True
-        for entry in DAOUtils.walk_tree_dao(dir_tree):
-            if entry.isDir():
-                continue
-            file_path = entry.pathFrom(vfs_tree)
-            src_path = organizer.resolvePath(file_path)
-            rel_path = os.path.relpath(file_path, dir_name)
+    def _deploy_secondary_files(
+        dir_name: str, deploy_dir: str, wanted: dict[str, tuple[str, str]], 
+        deployed: dict[str, dict[str, str]], link: bool,
+        ) -> bool:
+        """Deploy added or changed files (wanted: casefolded rel path -> (rel path, source path)) and remove stale ones, journaling each operation"""
+        journal_path = DAOLaunch._get_journal_path()
+        # Remove files no longer deployed, or now provided by a different source
+        stale = {
+            key: entry for key, entry in deployed.items()
+            if key not in wanted or wanted[key][1].casefold() != entry.get("src", "").casefold()
+            }
+        removed = len([key for key in stale if key not in wanted])
+        if not DAOLaunch._undeploy_secondary_files(dir_name, deploy_dir, stale):
+            return False
+        for key in stale:
+            del deployed[key]
+        # Deploy added or changed files
+        changed = 0
+        for key, (rel_path, src_path) in wanted.items():
             dst_path = DAOUtils.os_path(deploy_dir, rel_path)
-            if deploy:
-                backup = False
-                if DAOUtils.file_exists(dst_path):
-                    if not DAOUtils.create_backup(dst_path):
-                        return False
-                    backup = True
-                if not DAOUtils.copy_file(src_path, dst_path):
-                    if backup:
-                        DAOUtils.restore_backup(dst_path)
+            entry = deployed.get(key)
+            if entry is not None and DAOLaunch._is_deployed(entry, src_path, dst_path):
+                continue
+            stamp = DAOUtils.get_file_stamp(src_path) or (0, 0)
+            new_entry = {
+                "path": rel_path,
+                "src": src_path,
+                "size": str(stamp[0]),
+                "mtime": str(stamp[1]),
+                "hash": DAOUtils.hash_file(src_path),
+                "backup": "0",
+                }
+            if entry is not None:
+                # Replace our own previous deployment, keeping its backup
+                new_entry["backup"] = entry.get("backup", "0")
+            elif DAOUtils.file_exists(dst_path):
+                new_entry["backup"] = "1"
+                if not DAOUtils.append_journal(journal_path, [["B", dir_name, rel_path]]):
                     return False
-            else:
-                if DAOUtils.restore_backup(dst_path):
-                    continue
-                if not DAOUtils.remove_file(dst_path):
+                deployed[key] = {"path": rel_path, "backup": "1"}
+                if not DAOUtils.create_backup(dst_path, True):
+                    return False
+            if not DAOUtils.append_journal(journal_path, [DAOLaunch._deploy_record(dir_name, new_entry)]):
+                return False
+            deployed[key] = new_entry
+            if entry is not None and not DAOUtils.remove_file(dst_path):
+                return False
+            link_ok = link and rel_path.rpartition(".")[2].casefold() in DAOLaunch._link_extensions
+            deployed_ok = DAOUtils.link_file(src_path, dst_path) if link_ok else DAOUtils.copy_file(src_path, dst_path)
+            if not deployed_ok:
+                DAOLaunch._undeploy_secondary_files(dir_name, deploy_dir, {key: new_entry})
+                deployed.pop(key, None)
+                return False
+            changed += 1
+        DAOUtils.log_message(
+            f"Deployed {changed} {dir_name} file(s), {len(wanted) - changed} unchanged, {removed} removed."
+            )
+        return True
+
+    @staticmethod
+    def _is_deployed(entry: dict[str, str], src_path: str, dst_path: str) -> bool:
+        """Check if the deployed file still matches its source"""
+        src_stamp = DAOUtils.get_file_stamp(src_path)
+        dst_stamp = DAOUtils.get_file_stamp(dst_path)
+        if src_stamp is None or dst_stamp is None:
+            return False
+        if str(src_stamp[0]) != entry.get("size") or str(dst_stamp[0]) != entry.get("size"):
+            return False
+        if str(src_stamp[1]) == entry.get("mtime"):
+            return True
+        # Touched but identical content, e.g. mod re-installed
+        if DAOUtils.hash_file(src_path) != entry.get("hash"):
+            return False
+        entry["mtime"] = str(src_stamp[1])
+        return True
+
+    @staticmethod
+    def _undeploy_secondary_files(dir_name: str, deploy_dir: str, deployed: dict[str, dict[str, str]]) -> bool:
+        """Remove deployed files, restoring any backups, journaling each removal"""
+        journal_path = DAOLaunch._get_journal_path()
+        for key, entry in list(deployed.items()):
+            dst_path = DAOUtils.os_path(deploy_dir, entry["path"])
+            if entry.get("backup") == "1":
+                # Never remove a backed up path without its backup, it may be the original
+                if DAOUtils.file_exists(f"{dst_path}.mohidden") and not DAOUtils.restore_backup(dst_path):
                     return False
+            elif not DAOUtils.remove_file(dst_path):
+                return False
+            # Removal is idempotent, so it is journaled after the fact
+            if not DAOUtils.append_journal(journal_path, [["R", dir_name, entry["path"]]]):
+                return False
+            del deployed[key]
         return True
        
     #######################################
     ### Build Addins.xml and Offers.xml ###
     #######################################
 
+    LAUNCH_CACHE_DIR = r"plugins\basic_games\games\dao_game\DAO_Cache"
+
     _xml_tags = {
         "Addins" : ("AddInItem","AddInsList"),
         "Offers" : ("OfferItem","OfferList"),
     }
 
+    # Parsed manifest items, keyed by path -> ((size, mtime), items)
+    _manifest_cache: ClassVar[dict[str, tuple[tuple[int, int] | None, list[ET.Element]]]] = {}
+
     @staticmethod
-    def build_addins_offers_xml(target_dir: str, game_dir: str, organizer: mobase.IOrganizer) -> bool:
-        """Build Addins.xml and Offers.xml"""
+    def build_addins_offers_xml(target_dir: str, manifest_paths: dict[str, list[str]], profile_dir: str) -> bool:
+        """Build Addins.xml and Offers.xml (manifests from get_addins_offers_manifests, profile dir from get_profile_settings_dir)"""
         for mod_type, (item_tag, list_tag) in DAOLaunch._xml_tags.items():
-            
-            DAOUtils.log_message(f"Building {mod_type}.xml...")
-            path_list = DAOLaunch.get_file_paths("Manifest.xml", game_dir, organizer, mod_type)
-
-            item_dict: dict[str, ET.Element] = {} 
-            for path in path_list:
-                with open(path, encoding="utf-8") as f:
-                    raw_xml = f.read()
-                root = ET.fromstring(raw_xml)
-                item_list = root.find(list_tag)
-                if item_list is None:
-                    continue
-                for item in item_list.findall(item_tag):
-                    uid = item.get("UID")
-                    if uid:
-                        item_dict[uid] = item
 
+            DAOUtils.log_message(f"Building {mod_type}.xml...")
+            path_list = manifest_paths.get(mod_type, [])
             xml_gold = DAOUtils.os_path("plugins/basic_games/games/dao_game", f"DAO_{mod_type}.xml")
 
-            if DAOUtils.file_exists(xml_gold):
-                root = ET.parse(xml_gold).getroot()
-            else:
-                root = ET.Element(list_tag)   
-            existing_items = {item.get("UID"): item for item in root.findall(item_tag) if item.get("UID")}
-
-            for uid, new_item in item_dict.items():
-                if uid in existing_items:
-                    old_item = existing_items[uid]
-                    DAOUtils.overwrite_element(old_item, new_item)
-                    continue
-                root.append(new_item)
+            # Only rebuild when the manifests or gold file have changed
+            cache_path = DAOUtils.os_path(DAOLaunch.LAUNCH_CACHE_DIR, f"{mod_type}.xml")
+            fingerprint = DAOUtils.get_fingerprint([xml_gold, *path_list])
+            if DAOUtils.check_fingerprint(cache_path, fingerprint):
+                DAOUtils.log_message(f"No changes detected, using cached {mod_type}.xml.")
+            elif not DAOLaunch._write_addins_offers_cache(cache_path, fingerprint, xml_gold, path_list, item_tag, list_tag):
+                return False
 
-            xml_str = ET.tostring(root, encoding="unicode") 
-            xml_str = xml_str.replace('RequiresAuthorization="1"','RequiresAuthorization="0"')         
-            xml_bytes = DAOUtils.pretty_format_xml(xml_str)
             xml_path = DAOUtils.os_path(target_dir, "Settings", f"{mod_type}.xml")
             backup = False
             if DAOUtils.file_exists(xml_path):
                 if not DAOUtils.create_backup(xml_path):
                     return False
                 backup = True
-            if DAOUtils.write_file_bytes(xml_path, xml_bytes):
-                if DAOLaunch._create_profile_links(mod_type, xml_path, organizer):
+            if DAOUtils.copy_file(cache_path, xml_path):
+                if DAOLaunch._create_profile_links(mod_type, xml_path, profile_dir):
                     continue
             DAOUtils.restore_backup(xml_path) if backup else DAOUtils.remove_file(xml_path)
             return False
         return True
-    
+
     @staticmethod
-    def _create_profile_links(mod_type: str, xml_path: str, organizer: mobase.IOrganizer) -> bool:
-        """Creates addins.xml/offers.xml link from profile when profile-specific Game INI is enabled"""
+    def _write_addins_offers_cache(
+        cache_path: str, fingerprint: str, xml_gold: str,
+        path_list: list[str], item_tag: str, list_tag: str,
+        ) -> bool:
+        """Merge manifest items into the gold file and save to the launch cache."""
+        item_dict: dict[str, ET.Element] = {}
+        for path in path_list:
+            for item in DAOLaunch._read_manifest_items(path, item_tag, list_tag):
+                uid = item.get("UID")
+                if uid:
+                    # Copied, the merge below changes items and the parsed ones stay cached
+                    item_dict[uid] = copy.deepcopy(item)
+
+        if DAOUtils.file_exists(xml_gold):
+            root = ET.parse(xml_gold).getroot()
+        else:
+            root = ET.Element(list_tag)
+        existing_items = {item.get("UID"): item for item in root.findall(item_tag) if item.get("UID")}
+
+        for uid, new_item in item_dict.items():
+            if uid in existing_items:
+                old_item = existing_items[uid]
+                DAOUtils.overwrite_element(old_item, new_item)
+                continue
+            root.append(new_item)
+
+        for elem in root.iter():
+            if elem.get("RequiresAuthorization") == "1":
+                elem.set("RequiresAuthorization", "0")
+        if not DAOUtils.write_xml_file(cache_path, root):
+            return False
+        return DAOUtils.write_fingerprint(cache_path, fingerprint)
+
+    @staticmethod
+    def _read_manifest_items(path: str, item_tag: str, list_tag: str) -> list[ET.Element]:
+        """Read items from Manifest.xml, reusing the parsed items if file is unchanged."""
+        stamp = DAOUtils.get_file_stamp(path)
+        cached = DAOLaunch._manifest_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(path, encoding="utf-8") as f:
+            raw_xml = f.read()
+        root = ET.fromstring(raw_xml)
+        item_list = root.find(list_tag)
+        items = [] if item_list is None else item_list.findall(item_tag)
+        DAOLaunch._manifest_cache[path] = (stamp, items)
+        return items
+
+    @staticmethod
+    def get_profile_settings_dir(organizer: mobase.IOrganizer) -> str:
+        """Profile dir when profile-specific Game INI is enabled, else empty"""
         profile = organizer.profile()
-        profile_dir = profile.absolutePath()
-        if not profile.localSettingsEnabled():
+        return profile.absolutePath() if profile.localSettingsEnabled() else ""
+
+    @staticmethod
+    def _create_profile_links(mod_type: str, xml_path: str, profile_dir: str) -> bool:
+        """Creates addins.xml/offers.xml link from profile when profile-specific Game INI is enabled"""
+        if not profile_dir:
             return True
         link_path = DAOUtils.os_path(profile_dir, f"{mod_type}.xml")
         link_backup = False
@@ -300,77 +454,156 @@ class DAOLaunch:
     ##################################
     ### Build Chargenmorphcfg.xml  ###
     ##################################
+    # Competing Chargenmorphcfg.xml files currently hidden, one path per line
+    CHARGEN_HIDDEN_LIST = DAOUtils.os_path(LAUNCH_CACHE_DIR, "Chargenmorphcfg.hidden")
+
     @staticmethod
-    def build_chargenmorphcfg_xml(target_dir: str, game_dir: str, organizer: mobase.IOrganizer) -> bool:
-        """Dynamically build Chargenmorphcfg.xml based on contents of override dir"""
+    def build_chargenmorphcfg_xml(target_dir: str, game_dir: str, chargen_files: list[tuple[str, str]]) -> bool:
+        """Dynamically build Chargenmorphcfg.xml based on contents of override dir (files from get_chargen_files)"""
         DAOUtils.log_message(f"Building Chargenmorphcfg.xml...")
         ovrd_path = "packages/core/override"
+        xml_path = DAOUtils.os_path(target_dir, ovrd_path, "chargenmorphcfg.xml")
         
-        vfs_tree = organizer.virtualFileTree()
-        ovrd_tree = vfs_tree.find(ovrd_path, mobase.IFileTree.FileTypes.DIRECTORY)
-        if not isinstance(ovrd_tree, mobase.IFileTree):
-            return True
+        if not chargen_files:
+            return DAOLaunch.restore_chargenmorphcfg_xml(target_dir)
         
-        # Build vanilla chargenmorph tree
-        chargenmorph = DAOChargen.build_vanilla_chargen()
-
-        # Append new chargen files found in overrides
+        # Collect chargen files (loose or inside .erf) and competing Chargenmorphcfg.xml found in overrides
         visited: set[str] = set()
-        for entry in DAOUtils.walk_tree_dao(ovrd_tree):
-            if entry.isDir():
-                continue
-            name = entry.name().casefold()
-            base_name, ext = name.rsplit(".", 1)
-            if name in visited or ext not in {"mop", "mmh", "tnt", "dds"}:
-                continue    
-            visited.add(name)
-            resource_type = DAOChargen.get_resource_type(base_name, ext)
-            if not resource_type:
+        resources: list[tuple[str, str]] = []
+        competing: list[str] = DAOUtils.search_dir(DAOUtils.os_path(game_dir, ovrd_path), "chargenmorphcfg.xml")
+        for name, path in chargen_files:
+            if name == "chargenmorphcfg.xml":
+                if path.casefold() != xml_path.casefold():
+                    competing.append(path)
                 continue
-            DAOChargen.add_resource(chargenmorph, name, resource_type)
+            if name.endswith(".erf"):
+                file_names = DAOUtils.get_erf_paths(name, path)
+            else:
+                file_names = [name]
+            for file_name in file_names:
+                base_name, _, ext = file_name.rpartition(".")
+                if file_name in visited or ext not in {"mop", "mmh", "tnt", "dds"}:
+                    continue    
+                visited.add(file_name)
+                resource_type = DAOChargen.get_resource_type(base_name, ext)
+                if resource_type:
+                    resources.append((file_name, resource_type))
         if not visited:
             DAOUtils.log_message(f"No chargen mods detected.")
-            return True
+            return DAOLaunch.restore_chargenmorphcfg_xml(target_dir)
+
+        # Hide any competing files that appeared since the last launch
+        if competing:
+            with DAOUtils.trace_stage("chargenmorphcfg_hide"):
+                if not DAOLaunch._hide_chargenmorphcfg_files(competing):
+                    return False
 
-        DAOLaunch.hide_files("Chargenmorphcfg.xml", game_dir, organizer, ovrd_path)
+        # Only rebuild when the set of chargen resources has changed
+        cache_path = DAOUtils.os_path(DAOLaunch.LAUNCH_CACHE_DIR, "Chargenmorphcfg.xml")
+        fingerprint = DAOUtils.get_text_fingerprint(f"{name}|{resource_type}" for name, resource_type in resources)
+        if DAOUtils.check_fingerprint(cache_path, fingerprint):
+            if DAOUtils.file_exists(xml_path):
+                DAOUtils.log_message("No changes detected, using existing Chargenmorphcfg.xml.")
+                return True
+        else:
+            # Build vanilla chargenmorph tree and append new chargen files
+            chargenmorph = DAOChargen.build_vanilla_chargen()
+            resource_blocks = DAOChargen.get_resource_blocks(chargenmorph)
+            for name, resource_type in resources:
+                DAOChargen.add_resource(resource_blocks, name, resource_type)
+            if not DAOUtils.write_xml_file(cache_path, chargenmorph):
+                return False
+            if not DAOUtils.write_fingerprint(cache_path, fingerprint):
+                return False
         # Write completed tree to chargenmorphcfg.xml
-        xml_string = ET.tostring(chargenmorph, encoding="unicode")
-        xml_bytes = DAOUtils.pretty_format_xml(xml_string)
-        xml_path = DAOUtils.os_path(target_dir, ovrd_path, "chargenmorphcfg.xml")
-        if not DAOUtils.write_file_bytes(xml_path, xml_bytes):
-            DAOLaunch.hide_files("chargenmorphcfg.xml", game_dir, organizer, ovrd_path, True)
-            return False
-        return True
+        return DAOUtils.copy_file(cache_path, xml_path)
 
     @staticmethod
-    def get_file_paths(file_name: str, game_dir: str, organizer: mobase.IOrganizer, search_path: str,) -> list[str]:
-        """Return list of paths to all matching files"""
-        dir_name = DAOUtils.os_path(game_dir, search_path)
-        game_paths = DAOUtils.search_dir(dir_name, file_name)
-        game_paths.sort(key = DAOUtils.natural_sort_key)
+    def get_chargen_files(organizer: mobase.IOrganizer) -> list[tuple[str, str]]:
+        """Casefolded name and real path of each file in the chargen override trees, resolved on the UI thread"""
+        files: list[tuple[str, str]] = []
+        for ovrd_tree in DAOLaunch._get_chargen_trees(organizer):
+            for entry in DAOUtils.walk_tree_dao(ovrd_tree):
+                if entry.isDir():
+                    continue
+                name = entry.name().casefold()
+                # Only Chargenmorphcfg.xml and .erf files are opened, the rest is classified by name
+                path = ""
+                if name == "chargenmorphcfg.xml" or name.endswith(".erf"):
+                    path = DAOUtils.os_path(DAOUtils.resolve_path(organizer, entry.path()))
+                files.append((name, path))
+        return files
 
+    @staticmethod
+    def _get_chargen_trees(organizer: mobase.IOrganizer) -> list[mobase.IFileTree]:
+        """Return packages/core/override and each Addins/<uid>/core/override in the VFS"""
         vfs_tree = organizer.virtualFileTree()
-        search_tree = vfs_tree.find(search_path, mobase.IFileTree.FileTypes.DIRECTORY)
-        if not isinstance(search_tree, mobase.IFileTree):
-            return game_paths
-        
-        vfs_paths: list[str] = []
-        for path in DAOUtils.search_filetree(search_tree, file_name):
-            vfs_paths.append(organizer.resolvePath(path))
-        vfs_paths.sort(key = DAOUtils.natural_sort_key)
+        ovrd_trees: list[mobase.IFileTree] = []
+        ovrd_tree = vfs_tree.find("packages/core/override", mobase.IFileTree.FileTypes.DIRECTORY)
+        if isinstance(ovrd_tree, mobase.IFileTree):
+            ovrd_trees.append(ovrd_tree)
+        addins_tree = vfs_tree.find("Addins", mobase.IFileTree.FileTypes.DIRECTORY)
+        if not isinstance(addins_tree, mobase.IFileTree):
+            return ovrd_trees
+        uid_trees = [entry for entry in addins_tree if isinstance(entry, mobase.IFileTree)]
+        uid_trees.sort(key = lambda e: DAOUtils.natural_sort_key(e.name().casefold()))
+        for uid_tree in uid_trees:
+            ovrd_tree = uid_tree.find("core/override", mobase.IFileTree.FileTypes.DIRECTORY)
+            if isinstance(ovrd_tree, mobase.IFileTree):
+                ovrd_trees.append(ovrd_tree)
+        return ovrd_trees
 
-        return game_paths + vfs_paths
-    
     @staticmethod
-    def hide_files(search_name: str, game_dir: str, organizer: mobase.IOrganizer, search_path: str, unhide: bool = False) -> bool:
-        """Hides (or unhides) all matching files"""
-        path_list = DAOLaunch.get_file_paths(search_name, game_dir, organizer, search_path)
+    def restore_chargenmorphcfg_xml(target_dir: str) -> bool:
+        """Remove generated Chargenmorphcfg.xml and unhide competing files"""
+        xml_path = DAOUtils.os_path(target_dir, "packages/core/override", "chargenmorphcfg.xml")
+        hidden_list = DAOLaunch.CHARGEN_HIDDEN_LIST
+        if not DAOUtils.file_exists(hidden_list) and not DAOUtils.file_exists(xml_path):
+            return True
+        DAOUtils.log_message("Restoring chargenmorphcfg.xml.")
+        success = True
+        remaining: list[str] = []
+        for path in DAOUtils.read_file(hidden_list).splitlines() if DAOUtils.file_exists(hidden_list) else []:
+            hidden_path = f"{path}.mohidden"
+            if not DAOUtils.file_exists(hidden_path) or DAOUtils.file_exists(path):
+                continue
+            if not DAOUtils.move_file(hidden_path, path):
+                remaining.append(path)
+                success = False
+        if remaining:
+            DAOUtils.write_file_bytes(hidden_list, "".join(f"{path}\n" for path in remaining).encode("utf-8"))
+        elif not DAOUtils.remove_file(hidden_list):
+            success = False
+        return DAOUtils.remove_file(xml_path) and success
+
+    @staticmethod
+    def _hide_chargenmorphcfg_files(path_list: list[str]) -> bool:
+        """Hide competing files, recording them so they can be restored later"""
+        hidden_list = DAOLaunch.CHARGEN_HIDDEN_LIST
+        hidden = DAOUtils.read_file(hidden_list).splitlines() if DAOUtils.file_exists(hidden_list) else []
+        success = True
         for path in path_list:
-            new_path = f"{path}.mohidden"
-            if not DAOUtils.move_file(new_path, path) if unhide else DAOUtils.move_file(path, new_path):
-                return False
-        return True
-    
+            if not DAOUtils.move_file(path, f"{path}.mohidden"):
+                success = False
+                continue
+            hidden.append(path)
+        hidden = list(dict.fromkeys(hidden))
+        if not DAOUtils.write_file_bytes(hidden_list, "".join(f"{path}\n" for path in hidden).encode("utf-8")):
+            return False
+        return success
+
+    @staticmethod
+    def get_addins_offers_manifests(game_dir: str, organizer: mobase.IOrganizer) -> dict[str, list[str]]:
+        """Manifest paths per mod type (Addins, Offers), resolved on the UI thread"""
+        return {mod_type: DAOLaunch.get_manifest_paths(game_dir, organizer, mod_type) for mod_type in DAOLaunch._xml_tags}
+
+    @staticmethod
+    def get_manifest_paths(game_dir: str, organizer: mobase.IOrganizer, mod_type: str) -> list[str]:
+        """Return list of paths to all <mod_type>/<uid>/Manifest.xml files"""
+        game_paths = DAOUtils.search_manifests(DAOUtils.os_path(game_dir, mod_type))
+        vfs_paths = DAOUtils.search_vfs_manifests(organizer, mod_type)
+        return game_paths + vfs_paths
+
     ############################
     ### Move Save Game Files ###
     ############################
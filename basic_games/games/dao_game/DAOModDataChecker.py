@@ -1,5 +1,8 @@
 import mobase
 
+from typing import Any, Iterable
+
+from .DAOInstall import DAOInstall
 from .DAOUtils import DAOUtils
 
 #######################
@@ -11,27 +14,37 @@ class DAOModDataChecker(mobase.ModDataChecker):
         super().__init__()
         DAOModDataChecker._organizer = organizer
 
+    @DAOUtils.entry_point
     def dataLooksValid(self, filetree: mobase.IFileTree) -> mobase.ModDataChecker.CheckReturn:    
         #Fix: Single root folders getting traversed by Simple Installer:
         parent = filetree.parent()
         filetree = parent if parent else filetree
+        # Only a FIXABLE result keeps its classification, for the fix call that follows
+        DAOModDataChecker._classified = None
         #Skip checks for already installed files
         if filetree.name():
             return mobase.ModDataChecker.VALID
         #Check if fixable
         if DAOModDataChecker.is_data_fixable(filetree): 
             return mobase.ModDataChecker.FIXABLE
+        DAOModDataChecker._classified = None
         #if <case for data being invalid?>:
         #    return mobase.ModDataChecker.INVALID
         return mobase.ModDataChecker.VALID
     
+    @DAOUtils.entry_point
     def fix(self, filetree: mobase.IFileTree) -> mobase.IFileTree:
-        fix_queue = DAOModDataChecker.queue_fixes(filetree)
+        classification = DAOModDataChecker.get_classification(filetree)
+        # The tree changes below, so the classification is used once
+        DAOModDataChecker._classified = None
+        fix_queue = classification["fix_queue"]
         if fix_queue.__len__():
             filetree = DAOModDataChecker.execute_fixes(filetree, fix_queue)
-        duplicate_warning = DAOModDataChecker.get_setting("duplicate_warning")
-        if duplicate_warning:
-            DAOModDataChecker.check_duplicates(filetree, True)
+        if classification["duplicate_warning"] and classification["ovrd_duplicates"]:
+            DAOModDataChecker.report_duplicates(classification["ovrd_duplicates"])
+        # Flatten last, so duplicates are still reported before they are resolved
+        if classification["flatten"]:
+            DAOModDataChecker.flatten_override(filetree)
         return filetree 
        
     _dir_list = (
@@ -55,73 +68,154 @@ class DAOModDataChecker(mobase.ModDataChecker):
     @staticmethod
     def is_data_fixable(filetree: mobase.IFileTree) -> bool:
         """Check if mod data filetree needs fixing."""
-        duplicate_warning = DAOModDataChecker.get_setting("duplicate_warning")
-        if duplicate_warning and not filetree.name():
-            if DAOModDataChecker.check_duplicates(filetree, False):
-                return True
-        for entry in DAOUtils.walk_tree_dao(filetree): 
-            if entry.isDir():
-                continue
-            name = entry.name().casefold()
-            if name == "meta.ini":
-                continue
-            path = entry.pathFrom(filetree, '/').casefold()
-            suffix = entry.suffix().casefold()
-            if suffix == "mo2unpack":
-                continue
-            if (
-                # File is .dazip or .override archive
-                (suffix in DAOModDataChecker._archive_extensions)
-                or
-                # File is part of unpacked .dazip or .override archive
-                (path.startswith(DAOModDataChecker._archive_unpacked))
-                or 
-                # File is a binary and not already in bin_ship/
-                (suffix in DAOModDataChecker._bin_extensions and name not in DAOModDataChecker._bin_exceptions and path != f"bin_ship/{name}")
-                or
-                # File is a docs type and not already in docs/ (excluding chargenmorphcfg.xml and manifest.xml)
-                (suffix in DAOModDataChecker._docs_extensions and not path.startswith("docs/"))
-                or
-                # File is otherwise not in a valid directory (move to packages/core/override)
-                (not path.startswith(DAOModDataChecker._dir_list) and name != "systeminformation.xml")
-            ): return True
-        return False
-    
+        return DAOModDataChecker.get_classification(filetree)["fixable"]
+
+    # Last classification, kept from dataLooksValid for fix -> (tree signature, classification)
+    _classified: tuple[tuple[int, int, int], dict[str, Any]] | None = None
+
     @staticmethod
-    def queue_fixes(filetree: mobase.IFileTree) -> dict[str, mobase.FileTreeEntry]:
-        """Queue filetree fixes without modifying the tree."""
+    def get_classification(filetree: mobase.IFileTree) -> dict[str, Any]:
+        """Classification of filetree, reused while the same unchanged tree is checked and fixed."""
+        signature = DAOModDataChecker.tree_signature(filetree)
+        cached = DAOModDataChecker._classified
+        # The id can be reused once a tree is freed, so the queued entries must still sit in this tree
+        hit = (
+            cached is not None and cached[0] == signature
+            and DAOModDataChecker.entries_in_tree(cached[1]["fix_queue"].values(), filetree)
+        )
+        DAOUtils.count_cache("classify", hit)
+        if cached is not None and hit:
+            return cached[1]
+        classification = DAOModDataChecker.classify(filetree)
+        DAOModDataChecker._classified = (signature, classification)
+        return classification
+
+    @staticmethod
+    def tree_signature(filetree: mobase.IFileTree) -> tuple[int, int, int]:
+        """Cheap content check of filetree -> (id, top-level entry count, hash of top-level names)."""
+        entries = tuple((entry.name(), entry.isDir()) for entry in filetree)
+        return id(filetree), len(entries), hash(entries)
+
+    @staticmethod
+    def entries_in_tree(entries: Iterable[mobase.FileTreeEntry], filetree: mobase.IFileTree) -> bool:
+        """Check if every entry still sits in filetree, following its parents up."""
+        for entry in entries:
+            parent = entry.parent()
+            while parent is not None and parent is not filetree:
+                parent = parent.parent()
+            if parent is None:
+                return False
+        return True
+
+    @staticmethod
+    def classify(filetree: mobase.IFileTree) -> dict[str, Any]:
+        """Walk filetree once for fixability, the fix queue and duplicate files."""
+        duplicate_warning = bool(DAOModDataChecker.get_setting("duplicate_warning"))
+        flatten = bool(DAOModDataChecker.get_setting("flatten_override"))
+        fixable = False
         fix_queue: dict[str, mobase.FileTreeEntry] = {}
-        flatten = DAOModDataChecker.get_setting("flatten_override")
+        # New path -> casefolded path the queued file is moved from
+        moved_from: dict[str, str] = {}
+        # Casefolded name -> casefolded paths of every file with that name
+        names: dict[str, list[str]] = {}
         for entry in DAOUtils.walk_tree_dao(filetree):
             if entry.isDir():
                 continue
             name = entry.name()
-            lower_name = name.casefold()
             path = entry.pathFrom(filetree, '/')
             lower_path = path.casefold()
             suffix = entry.suffix().casefold()
+            names.setdefault(name.casefold(), []).append(lower_path)
             if suffix == "mo2unpack":
                 continue
+            if not fixable:
+                fixable = DAOModDataChecker.is_entry_fixable(name.casefold(), lower_path, suffix, flatten)
+            new_path = DAOModDataChecker.get_fix_path(name, path, suffix)
+            if new_path:
+                fix_queue[new_path] = entry
+                moved_from[new_path] = lower_path
+        duplicates = {name: paths for name, paths in names.items() if len(paths) > 1}
+        if duplicate_warning and duplicates and not filetree.name():
+            fixable = True
+        # Casefolded path -> name, as the files will be laid out once fixed
+        fixed_paths = {path: name for name, paths in names.items() for path in paths}
+        for new_path, lower_path in moved_from.items():
+            name = fixed_paths.pop(lower_path, None)
+            if name is not None:
+                fixed_paths[new_path.casefold()] = name
+        ovrd_dir = "packages/core/override/"
+        ovrd_names: dict[str, list[str]] = {}
+        for path, name in fixed_paths.items():
+            if path.startswith(ovrd_dir):
+                ovrd_names.setdefault(name, []).append(path[len(ovrd_dir):])
+        # Same order as a walk of the fixed override dir, groups in the order duplicates are found
+        ovrd_duplicates = sorted(
+            (sorted(paths, key=DAOModDataChecker.walk_order_key) for paths in ovrd_names.values() if len(paths) > 1),
+            key=lambda paths: DAOModDataChecker.walk_order_key(paths[1]),
+        )
+        return {
+            "fixable": fixable,
+            "fix_queue": fix_queue,
+            "duplicates": duplicates,
+            "ovrd_duplicates": {fixed_paths[f"{ovrd_dir}{paths[0]}"]: paths for paths in ovrd_duplicates},
+            "duplicate_warning": duplicate_warning,
+            "flatten": flatten,
+        }
+
+    @staticmethod
+    def walk_order_key(path: str) -> list[tuple[int, list[tuple[int, str | int]]]]:
+        """Sort key placing a '/' separated path where walk_tree_dao would visit it."""
+        *dirs, name = path.split("/")
+        return [(1, DAOUtils.natural_sort_key(dir)) for dir in dirs] + [(0, DAOUtils.natural_sort_key(name))]
+
+    @staticmethod
+    def is_entry_fixable(name: str, path: str, suffix: str, flatten: bool) -> bool:
+        """Check if a single file (casefolded name, path and suffix) needs fixing."""
+        if name == "meta.ini":
+            return False
+        return (
             # File is .dazip or .override archive
-            if suffix in DAOModDataChecker._archive_extensions:
-                new_path = f"{name}.mo2unpack"
+            (suffix in DAOModDataChecker._archive_extensions)
+            or
             # File is part of unpacked .dazip or .override archive
-            elif lower_path.startswith(DAOModDataChecker._archive_unpacked):
-                new_path = f"mo2unpack/{path}"
-            elif lower_name == "manifest.xml":
-                new_path = f"mo2unpack/{name}"
-            # File is a binary type   
-            elif suffix in DAOModDataChecker._bin_extensions:
-                new_path = f"bin_ship/{name}"
-            # File is a docs type (excluding chargenmorphcfg.xml and manifest.xml)
-            elif suffix in DAOModDataChecker._docs_extensions:
-                new_path = f"docs/{name}"
+            (path.startswith(DAOModDataChecker._archive_unpacked))
+            or 
+            # File is a binary and not already in bin_ship/
+            (suffix in DAOModDataChecker._bin_extensions and name not in DAOModDataChecker._bin_exceptions and path != f"bin_ship/{name}")
+            or
+            # File is a docs type and not already in docs/ (excluding chargenmorphcfg.xml and manifest.xml)
+            (suffix in DAOModDataChecker._docs_extensions and not path.startswith("docs/"))
+            or
             # File is otherwise not in a valid directory (move to packages/core/override)
-            elif not lower_path.startswith(DAOModDataChecker._dir_list):
-                new_path = f"packages/core/override_mo2flatten/{path}" if flatten else f"packages/core/override/{path}"
-            else: continue         
-            fix_queue[new_path] = entry
-        return fix_queue
+            (not path.startswith(DAOModDataChecker._dir_list) and name != "systeminformation.xml")
+            or
+            # File is in a subdir of packages/core/override and override is flattened
+            (flatten and path.startswith("packages/core/override/") and path.count("/") > 3)
+        )
+
+    @staticmethod
+    def get_fix_path(name: str, path: str, suffix: str) -> str:
+        """New path of a single file once fixed, empty if it stays in place."""
+        lower_name = name.casefold()
+        lower_path = path.casefold()
+        # File is .dazip or .override archive
+        if suffix in DAOModDataChecker._archive_extensions:
+            return f"{name}.mo2unpack"
+        # File is part of unpacked .dazip or .override archive
+        if lower_path.startswith(DAOModDataChecker._archive_unpacked):
+            return f"mo2unpack/{path}"
+        if lower_name == "manifest.xml":
+            return f"mo2unpack/{name}"
+        # File is a binary type   
+        if suffix in DAOModDataChecker._bin_extensions:
+            return f"bin_ship/{name}"
+        # File is a docs type (excluding chargenmorphcfg.xml and manifest.xml)
+        if suffix in DAOModDataChecker._docs_extensions:
+            return f"docs/{name}"
+        # File is otherwise not in a valid directory (move to packages/core/override)
+        if not lower_path.startswith(DAOModDataChecker._dir_list):
+            return f"packages/core/override/{path}"
+        return ""
     
     @staticmethod
     def execute_fixes(filetree: mobase.IFileTree, fix_queue: dict[str, mobase.FileTreeEntry]) -> mobase.IFileTree:
@@ -132,40 +226,53 @@ class DAOModDataChecker(mobase.ModDataChecker):
             if parent is not None:
                 DAOUtils.trim_branch(parent)
         return filetree  
-    
+
     @staticmethod
-    def check_duplicates(filetree: mobase.IFileTree, ovrd: bool) -> bool:
-        """Check for duplicate files in filetree"""
-        if ovrd:
-            search_tree = filetree.find("packages/core/override",mobase.FileTreeEntry.FileTypes.DIRECTORY)
-            if not isinstance(search_tree, mobase.IFileTree):
-                search_tree = filetree.find("packages/core/override_mo2flatten",mobase.FileTreeEntry.FileTypes.DIRECTORY)
-        else:
-            search_tree = filetree
-        if not isinstance(search_tree, mobase.IFileTree):
-            return False
-        seen: dict[str, str] = {}
-        duplicates: dict[str, list[str]] = {}
-        for entry in DAOUtils.walk_tree_dao(search_tree):
+    def flatten_override(filetree: mobase.IFileTree) -> None:
+        """Move every file below packages/core/override directly into it, resolving duplicates like flatten_override_dir."""
+        ovrd_tree = filetree.find("packages/core/override", mobase.FileTreeEntry.FileTypes.DIRECTORY)
+        if not isinstance(ovrd_tree, mobase.IFileTree):
+            return
+        # Casefolded name -> (sort key, entry); subdir files replace loose ones, last in natural order wins
+        winners: dict[str, tuple[tuple[bool, list[tuple[int, str | int]]], mobase.FileTreeEntry]] = {}
+        losers: list[mobase.FileTreeEntry] = []
+        for entry in DAOUtils.walk_tree_dao(ovrd_tree):
             if entry.isDir():
                 continue
+            path = entry.pathFrom(ovrd_tree, "/")
+            key = DAOInstall.flatten_key(path)
             name = entry.name().casefold()
-            rel_path = entry.pathFrom(search_tree, "/").casefold()
-            if name not in seen:
-                seen[name] = rel_path
+            current = winners.get(name)
+            if current is not None and current[0] > key:
+                losers.append(entry)
                 continue
-            if name not in duplicates:
-                duplicates[name] = [seen[name]]
-            duplicates[name].append(rel_path)
-        if duplicates:
-            if ovrd:
-                DAOUtils.log_message(f"Logging duplicate files...")
-                for name, paths in duplicates.items():
-                    msg = f"Duplicate File:\n -- {name.upper()} --\n -> {"\n -> ".join(paths)}"
-                    DAOUtils.log_message(msg)
-                DAOModDataChecker.show_duplicate_warning()
-            return True
-        return False
+            if current is not None:
+                losers.append(current[1])
+            winners[name] = (key, entry)
+        # Loose losers are replaced by the move below
+        for entry in losers:
+            if "/" not in entry.pathFrom(ovrd_tree, "/"):
+                continue
+            parent = entry.parent()
+            entry.detach()
+            if parent is not None:
+                DAOUtils.trim_branch(parent)
+        for key, entry in winners.values():
+            if not key[0]:
+                continue
+            parent = entry.parent()
+            ovrd_tree.move(entry, entry.name(), mobase.IFileTree.InsertPolicy.REPLACE)
+            if parent is not None:
+                DAOUtils.trim_branch(parent)
+
+    @staticmethod
+    def report_duplicates(duplicates: dict[str, list[str]]) -> None:
+        """Log duplicate files in the override dir and warn the user"""
+        DAOUtils.log_message("Logging duplicate files...")
+        for name, paths in duplicates.items():
+            msg = f"Duplicate File:\n -- {name.upper()} --\n -> {"\n -> ".join(paths)}"
+            DAOUtils.log_message(msg)
+        DAOModDataChecker.show_duplicate_warning()
 
     @staticmethod
     def show_duplicate_warning():
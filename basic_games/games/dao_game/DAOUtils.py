@@ -1,15 +1,28 @@
+import cProfile
+import errno
+import functools
 import hashlib
+import json
 import mobase
 import os
+import pstats
 import re
 import shutil
 import struct
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
 import xml.dom.minidom
 import zipfile
 
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
 from PyQt6.QtCore import qInfo, Qt
 from PyQt6.QtWidgets import QMessageBox, QProgressDialog
-from typing import Iterable
+from typing import Any, Callable, ClassVar, Iterable, Iterator, TextIO
 from xml.etree import ElementTree as ET
 
 ####################
@@ -26,27 +39,33 @@ class DAOUtils:
     ## Logging Utils ##
     ###################
 
+    # enable_logging as last read on the UI thread, worker threads must not call into mobase
+    _logging_enabled = True
+
     @staticmethod
     def log_message(message:str):
-        if DAOUtils._organizer.pluginSetting(
-            DAOUtils._plugin_name,
-            "enable_logging",
-        ): qInfo(f"[DAO] {message}")
+        if threading.current_thread() is threading.main_thread():
+            DAOUtils._logging_enabled = bool(DAOUtils._organizer.pluginSetting(
+                DAOUtils._plugin_name,
+                "enable_logging",
+            ))
+        if DAOUtils._logging_enabled:
+            qInfo(f"[DAO] {message}")
 
     ####################
     ## Filetree Utils ##
     ####################    
-    @staticmethod 
-    def search_filetree(filetree: mobase.IFileTree, filename: str) -> list[str]:
-        """Returns path of any files matching the filename."""
+    @staticmethod
+    def search_filetree_manifests(filetree: mobase.IFileTree) -> list[str]:
+        """Returns path of each <uid>/Manifest.xml found one level below the filetree."""
         result: list[str] = []
-        for entry in DAOUtils.walk_tree_dao(filetree):
-            if not entry.isFile():
+        for entry in filetree:
+            if not isinstance(entry, mobase.IFileTree):
                 continue
-            if entry.name().casefold() != filename.casefold():
+            manifest = entry.find("Manifest.xml", mobase.IFileTree.FileTypes.FILE)
+            if manifest is None:
                 continue
-            file_path = entry.path()
-            result.append(file_path)
+            result.append(manifest.path())
         return result
 
     @staticmethod 
@@ -83,19 +102,23 @@ class DAOUtils:
         dir = os.path.dirname(dst)
         if not DAOUtils.make_dirs(dir):
             return False
+        start = time.perf_counter()
         try:
             shutil.copy2(src, dst)
+            DAOUtils._record_file_op("copied", start, os.path.getsize(dst))
             return True 
         except Exception as e:
             DAOUtils.log_message(f"Failed to copy file {src} to {dst}: {e}.")    
             return False
     
     @staticmethod 
-    def create_backup(src: str) -> bool:
+    def create_backup(src: str, move: bool = False) -> bool:
         if not DAOUtils.file_exists(src):
             DAOUtils.log_message(f"Failed to create backup. File not found {src}")
             return False
         dst = f"{src}.mohidden"
+        if move:
+            return DAOUtils.move_file_overwrite(src, dst)
         return DAOUtils.copy_file(src, dst)
 
     @staticmethod
@@ -120,23 +143,28 @@ class DAOUtils:
         return True
 
     @staticmethod 
-    def create_archive(src: str, dst: str, delete: bool = True) -> bool:
-        """Create an archive from the contents of src and save it to dst. Optionally delete the original files."""
-        if not os.path.isdir(src):
-            DAOUtils.log_message(f"Source directory not found: {src}.")
-            return False
-        try:
-            with zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zip_ref:
-                for root, _, files in os.walk(src):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, src)
-                        zip_ref.write(file_path, arcname)
-        except Exception as e:
-            DAOUtils.log_message(f"Failed to create archive {dst} from {src}: {e}.")
+    def append_to_archive(dst: str, files: dict[str, str]) -> bool:
+        """Append files (arcname -> path) to an existing zip in place, skipping arcnames already present."""
+        if not zipfile.is_zipfile(dst):
+            DAOUtils.log_message(f"Failed to append to archive {dst}: Not a zip archive.")
             return False
-        return DAOUtils.remove_dir(src) if delete else True
-                  
+        start = time.perf_counter()
+        byte_count = 0
+        try:
+            # Existing members are left as they are, only the central directory is rewritten
+            with zipfile.ZipFile(dst, "a", zipfile.ZIP_DEFLATED) as zip_ref:
+                existing = {name.casefold() for name in zip_ref.namelist()}
+                for arcname, src in files.items():
+                    if arcname.casefold() in existing:
+                        continue
+                    zip_ref.write(src, arcname)
+                    byte_count += os.path.getsize(src)
+        except (OSError, zipfile.BadZipFile) as e:
+            DAOUtils.log_message(f"Failed to append to archive {dst}: {e}.")
+            return False
+        DAOUtils._record_file_op("written", start, byte_count)
+        return True
+
     @staticmethod 
     def extract_archive(src: str, dst: str, delete: bool = True) -> bool:
         """Extract archive at src to dst. Optionally delete the original archive."""
@@ -144,31 +172,162 @@ class DAOUtils:
             return False
         try:
             with zipfile.ZipFile(src, "r") as zip_ref:
-                members = zip_ref.infolist()
-                total = len(members)
-
-                progress = QProgressDialog(f"Extracting {os.path.basename(src)}", None, 0, total)
-                progress.setWindowModality(Qt.WindowModality.ApplicationModal)
-                progress.setAutoClose(True)
-                progress.setMinimumDuration(250)
-                progress.setValue(0)
-
-                for i, member in enumerate(members):
-                    zip_ref.extract(member, dst)
-                    progress.setValue(i + 1)
+                plan: dict[str, zipfile.ZipInfo] = {}
+                for member in zip_ref.infolist():
+                    name = DAOUtils.safe_member_name(member.filename)
+                    if name:
+                        plan[DAOUtils.os_path(dst, name)] = member
+                if not DAOUtils.extract_members(zip_ref, plan):
+                    return False
         except Exception as e:
             DAOUtils.log_message(f"Failed to extract archive {src} to {dst}: {e}.")
             return False
         return DAOUtils.remove_file(src) if delete else True
 
+    # Worker threads per archive, each with its own zip handle
+    EXTRACT_WORKERS = 4
+    # Seconds between progress dialog updates while extracting
+    PROGRESS_INTERVAL = 0.1
+
+    @staticmethod
+    def extract_members(zip_ref: zipfile.ZipFile, plan: dict[str, zipfile.ZipInfo], max_workers: int = EXTRACT_WORKERS) -> bool:
+        """Write each planned archive member (dst -> member) straight to its destination path, in parallel."""
+        if zip_ref.filename is None:
+            # Not backed by a file, workers cannot open their own handles
+            for dst, member in plan.items():
+                if member.is_dir():
+                    if not DAOUtils.make_dirs_cached(dst):
+                        return False
+                elif not DAOUtils.extract_member(zip_ref, member, dst):
+                    return False
+            return True
+        archive = zip_ref.filename
+        return DAOUtils.extract_from_archives(
+            {dst: (archive, member) for dst, member in plan.items()}, os.path.basename(archive), max_workers)
+
+    @staticmethod
+    def extract_from_archives(plan: dict[str, tuple[str, zipfile.ZipInfo]], label: str, max_workers: int = EXTRACT_WORKERS) -> bool:
+        """Write each planned member (dst -> (archive path, member)) straight to its destination path, in parallel."""
+        # The dir cache lasts one extraction, dirs may have been removed outside the plugin since (e.g. MO2 removing a mod)
+        DAOUtils._forget_dirs()
+        # Create every dir up front, so workers only write files
+        # Normcased dst -> (dst, archive, member), dsts differing only in case are one file on Windows: the last member wins
+        winners: dict[str, tuple[str, str, zipfile.ZipInfo]] = {}
+        for dst, (archive, member) in plan.items():
+            if not DAOUtils.make_dirs_cached(dst if member.is_dir() else os.path.dirname(dst)):
+                return False
+            if not member.is_dir():
+                winners[os.path.normcase(dst)] = (dst, archive, member)
+        files = list(winners.values())
+        total = len(files)
+        if not total:
+            return True
+        progress = QProgressDialog(f"Extracting {label}", None, 0, total)
+        progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        progress.setAutoClose(True)
+        progress.setMinimumDuration(250)
+        progress.setValue(0)
+        # ZipFile handles are not safe to share across threads, so open one per worker and archive
+        local = threading.local()
+        handles: list[zipfile.ZipFile] = []
+        handles_lock = threading.Lock()
+
+        def extract(dst: str, archive: str, member: zipfile.ZipInfo) -> bool:
+            opened: dict[str, zipfile.ZipFile] | None = getattr(local, "handles", None)
+            if opened is None:
+                opened = local.handles = {}
+            handle = opened.get(archive)
+            if handle is None:
+                handle = opened[archive] = zipfile.ZipFile(archive, "r")
+                with handles_lock:
+                    handles.append(handle)
+            return DAOUtils.extract_member(handle, member, dst)
+
+        result = True
+        last_update = time.perf_counter()
+        try:
+            if max_workers <= 1 or total == 1:
+                for i, (dst, archive, member) in enumerate(files):
+                    if not extract(dst, archive, member):
+                        return False
+                    if time.perf_counter() - last_update >= DAOUtils.PROGRESS_INTERVAL:
+                        progress.setValue(i + 1)
+                        last_update = time.perf_counter()
+                return True
+            with ThreadPoolExecutor(max_workers=min(max_workers, total), thread_name_prefix="dao_extract") as pool:
+                futures = [pool.submit(extract, dst, archive, member) for dst, archive, member in files]
+                for i, future in enumerate(as_completed(futures)):
+                    try:
+                        done = future.result()
+                    except OSError as e:
+                        DAOUtils.log_message(f"Failed to extract {label}: {e}.")
+                        done = False
+                    if not done:
+                        result = False
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    if time.perf_counter() - last_update >= DAOUtils.PROGRESS_INTERVAL:
+                        progress.setValue(i + 1)
+                        last_update = time.perf_counter()
+        finally:
+            for handle in handles:
+                handle.close()
+            progress.close()
+        return result
+
+    @staticmethod
+    def extract_member(zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, dst: str) -> bool:
+        """Stream a single archive member to dst, replacing any existing file."""
+        path = os.path.dirname(dst)
+        if not DAOUtils.make_dirs_cached(path):
+            return False
+        for attempt in (0, 1):
+            start = time.perf_counter()
+            try:
+                with zip_ref.open(member) as src, open(dst, "wb") as f:
+                    shutil.copyfileobj(src, f, 1024 * 1024)
+                DAOUtils._record_file_op("written", start, member.file_size)
+                return True
+            except FileNotFoundError as e:
+                # A cached parent dir may have been removed since, create it and retry once
+                DAOUtils._forget_dirs(path)
+                if attempt == 0 and DAOUtils.make_dirs_cached(path):
+                    continue
+                DAOUtils.log_message(f"Failed to extract {member.filename} to {dst}: {e}.")
+                return False
+            except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+                DAOUtils.log_message(f"Failed to extract {member.filename} to {dst}: {e}.")
+                return False
+        return False
+
     @staticmethod
     def file_exists(file_path: str) -> bool:
         "Check if file exists at path"
         if os.path.exists(file_path):
             return os.path.isfile(file_path)
         return False
-    
-    @staticmethod 
+
+    @staticmethod
+    def get_file_birthtime(file_path: str) -> int | None:
+        """Return creation time of file at path (ns), or None if not found."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        # st_birthtime is only reported on some platforms, Windows st_ctime is creation time
+        return getattr(stat, "st_birthtime_ns", stat.st_ctime_ns)
+
+    @staticmethod
+    def get_file_stamp(file_path: str) -> tuple[int, int] | None:
+        """Return (size, mtime) of file at path, or None if not found."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
     def get_info(path: str) -> list[str]:
         base, ext = path.rsplit(".", 1)
         name = os.path.basename(base)
@@ -184,6 +343,27 @@ class DAOUtils:
         except Exception as e:
             DAOUtils.log_message(f"Failed to get relative path for {path} from {base}: {e}")
 
+    @staticmethod 
+    def link_file(src: str, dst: str) -> bool:
+        """"Hard-link src file to dst, else symlink, else copy."""
+        dir = os.path.dirname(dst)
+        if not DAOUtils.make_dirs(dir):
+            return False
+        start = time.perf_counter()
+        try:
+            os.link(src, dst)
+            DAOUtils._record_file_op("linked", start)
+            return True
+        except OSError:
+            pass
+        try:
+            os.symlink(src, dst)
+            DAOUtils._record_file_op("linked", start)
+            return True
+        except OSError:
+            pass
+        return DAOUtils.copy_file(src, dst)
+
     @staticmethod 
     def list_files(path: str) -> set[str]:
         """"List all files in a directory"""
@@ -209,11 +389,63 @@ class DAOUtils:
             DAOUtils.log_message(f"Failed to create dirs {path}: {e}.")
             return False
 
+    # Dirs already created by make_dirs_cached, keyed by normcased path
+    _made_dirs: ClassVar[set[str]] = set()
+    # Extraction and flatten workers share the cache
+    _made_dirs_lock = threading.Lock()
+
+    @staticmethod 
+    def make_dirs_cached(path: str) -> bool:
+        """"Create dir at specified path, once per path."""
+        key = os.path.normcase(os.path.normpath(path)) if path else ""
+        if not key:
+            return True
+        with DAOUtils._made_dirs_lock:
+            if key in DAOUtils._made_dirs:
+                return True
+        if not DAOUtils.make_dirs(path):
+            return False
+        with DAOUtils._made_dirs_lock:
+            DAOUtils._made_dirs.add(key)
+        return True
+
+    @staticmethod 
+    def _forget_dirs(path: str | None = None, keep_root: bool = False) -> None:
+        """Drop path and its subdirs from the make_dirs_cached cache, after they were removed or moved. Every dir if no path."""
+        with DAOUtils._made_dirs_lock:
+            if path is None:
+                DAOUtils._made_dirs.clear()
+                return
+            key = os.path.normcase(os.path.normpath(path))
+            prefix = os.path.join(key, "")
+            DAOUtils._made_dirs.difference_update([
+                dir for dir in DAOUtils._made_dirs
+                if dir.startswith(prefix) or (not keep_root and dir == key)
+            ])
+
+    @staticmethod 
+    def move_dir(src: str, dst: str) -> bool:
+        """"Rename a whole dir to dst, only if dst does not exist yet."""
+        if os.path.lexists(dst):
+            return False
+        if not DAOUtils.make_dirs_cached(os.path.dirname(dst)):
+            return False
+        start = time.perf_counter()
+        try:
+            os.rename(src, dst)
+            DAOUtils._forget_dirs(src)
+            DAOUtils._record_file_op("moved", start)
+            return True
+        except OSError:
+            return False
+
     @staticmethod 
     def move_file(src: str, dst: str) -> bool:
         """"Move src file to dst."""
+        start = time.perf_counter()
         try:
             shutil.move(src, dst)
+            DAOUtils._record_file_op("moved", start)
             return True
         except Exception as e:
             DAOUtils.log_message(f"Failed to move file {src} to {dst}: {e}.")
@@ -222,17 +454,37 @@ class DAOUtils:
     @staticmethod 
     def move_file_overwrite(src: str, dst: str) -> bool:
         """"Move src file to dst, with overwrite."""
-        if not DAOUtils.remove_file(dst):
-            return False
-        return DAOUtils.move_file(src, dst)
+        return DAOUtils._replace_file(src, dst, False)
 
     @staticmethod    
     def move_file_overwrite_dirs(src: str, dst: str) -> bool:
         """"Move src file to dst, with overwrite. Create dirs where necessary."""
         path = os.path.dirname(dst)
-        if not DAOUtils.make_dirs(path):
+        if not DAOUtils.make_dirs_cached(path):
             return False
-        return DAOUtils.move_file_overwrite(src, dst)
+        return DAOUtils._replace_file(src, dst, True)
+
+    @staticmethod    
+    def _replace_file(src: str, dst: str, make_dirs: bool) -> bool:
+        """"Move src file over dst with a single rename, copying only across devices."""
+        for attempt in (0, 1):
+            start = time.perf_counter()
+            try:
+                os.replace(src, dst)
+                DAOUtils._record_file_op("moved", start)
+                return True
+            except OSError as e:
+                if e.errno == errno.EXDEV:
+                    return DAOUtils.remove_file(dst) and DAOUtils.move_file(src, dst)
+                # A cached parent dir may have been removed since, create it and retry once
+                path = os.path.dirname(dst)
+                if attempt == 0 and make_dirs and not os.path.isdir(path):
+                    DAOUtils._forget_dirs(path)
+                    if DAOUtils.make_dirs_cached(path):
+                        continue
+                DAOUtils.log_message(f"Failed to move file {src} to {dst}: {e}.")
+                return False
+        return False
         
     @staticmethod  
     def merge_dirs(src_dir: str, dst_dir: str) -> bool:
@@ -240,25 +492,32 @@ class DAOUtils:
         if not os.path.isdir(src_dir):
             DAOUtils.log_message(f"Failed to merge with {dst_dir} - Directory not found: {src_dir}.")
             return False
-        for root, _, files in os.walk(src_dir):
+        if DAOUtils.move_dir(src_dir, dst_dir):
+            return True
+        for root, dirs, files in os.walk(src_dir):
+            rel_path = DAOUtils.get_rel_path(root, src_dir)
+            if rel_path is None:
+                continue
             for file in files:
-                rel_path = DAOUtils.get_rel_path(root, src_dir)
-                if rel_path is None:
-                    continue
                 src = DAOUtils.os_path(src_dir, rel_path, file)
                 dst = DAOUtils.os_path(dst_dir, rel_path, file)
                 if DAOUtils.move_file_overwrite_dirs(src, dst):
                     continue
                 DAOUtils.log_message(f"Failed to merge files from {src_dir} to {dst_dir}.")
                 return False
+            # Subtrees missing from dst_dir move with a single rename
+            for dir in list(dirs):
+                if DAOUtils.move_dir(DAOUtils.os_path(root, dir), DAOUtils.os_path(dst_dir, rel_path, dir)):
+                    dirs.remove(dir)
         return DAOUtils.remove_dir(src_dir)
     
+    _natural_split_re = re.compile(r"(\d+)")
+
     @staticmethod
     def natural_sort_key(s: str):
         """Windows-like natural sort key."""
         out: list[tuple[int, str|int]] = []
-        split_re = re.compile(r'(\d+)')
-        for t in split_re.split(s):
+        for t in DAOUtils._natural_split_re.split(s):
             if not t:
                 continue
             if t.isdigit():
@@ -279,6 +538,12 @@ class DAOUtils:
         path = DAOUtils.os_path(*parts)
         return path.casefold()
     
+    @staticmethod 
+    def safe_member_name(name: str) -> str:
+        """Archive member name with drive, empty, '.' and '..' parts dropped, '/' separated."""
+        name = re.sub(r"^[A-Za-z]:", "", name.replace("\\", "/"))
+        return "/".join(part for part in name.split("/") if part not in ("", ".", ".."))
+
     @staticmethod 
     def read_file(file_path: str) -> str:
         """Read file to string"""
@@ -293,12 +558,17 @@ class DAOUtils:
     @staticmethod 
     def remove_file(file_path: str) -> bool:
         """Remove file at path."""
-        if not DAOUtils.file_exists(file_path):
-            return True
+        start = time.perf_counter()
         try:
             os.unlink(file_path)
+            DAOUtils._record_file_op("removed", start)
+            return True
+        except FileNotFoundError:
             return True
         except Exception as e:
+            # Dirs are not files, nothing to remove
+            if os.path.isdir(file_path):
+                return True
             DAOUtils.log_message(f"Failed to remove file {file_path}: {e}.")
             return False
 
@@ -309,6 +579,7 @@ class DAOUtils:
             return True
         try:
             shutil.rmtree(dir_path)
+            DAOUtils._forget_dirs(dir_path)
             return True
         except Exception as e:
             DAOUtils.log_message(f"Failed to remove dir {dir_path}: {e}")
@@ -330,6 +601,7 @@ class DAOUtils:
                 except Exception as e:
                     DAOUtils.log_message(f"Failed to remove dir {full_path}: {e}")
                     result = False
+        DAOUtils._forget_dirs(dir_path, keep_root=True)
         return result
 
     @staticmethod
@@ -391,28 +663,213 @@ class DAOUtils:
         """Write bytes to file"""
         if not DAOUtils.touch_file(file_path):
             return False
+        start = time.perf_counter()
         try:
             with open(file_path, "wb") as f:
                 f.write(file_content)
+            DAOUtils._record_file_op("written", start, len(file_content))
             return True
         except Exception as e:
             DAOUtils.log_message(f"Failed to write to file {file_path}: {e}")
-            return False        
-    
-    
+            return False
+
+    #################
+    ## Cache Utils ##
+    #################
+
+    # File digests, keyed by algorithm and casefolded path -> ((size, mtime), digest)
+    _hash_cache: ClassVar[dict[str, tuple[tuple[int, int], str]]] = {}
+
+    @staticmethod
+    def get_fingerprint(file_paths: Iterable[str]) -> str:
+        """Digest of file paths along with their (size, mtime) stamps."""
+        sha1 = hashlib.sha1()
+        for path in file_paths:
+            stamp = DAOUtils.get_file_stamp(path)
+            sha1.update(f"{path.casefold()}|{stamp}\n".encode())
+        return sha1.hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: str, algorithm: str = "sha1") -> str:
+        """Digest of file contents, reusing the digest if file is unchanged."""
+        key = f"{algorithm}:{file_path.casefold()}"
+        stamp = DAOUtils.get_file_stamp(file_path)
+        cached = DAOUtils._hash_cache.get(key)
+        hit = stamp is not None and cached is not None and cached[0] == stamp
+        DAOUtils.count_cache("hash", hit)
+        if hit:
+            return cached[1]
+        digest = hashlib.new(algorithm)
+        try:
+            with DAOUtils.timed("hash.file"), open(file_path, "rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    digest.update(chunk)
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to hash file {file_path}: {e}")
+            return ""
+        if stamp is not None:
+            DAOUtils._hash_cache[key] = (stamp, digest.hexdigest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_text_fingerprint(lines: Iterable[str]) -> str:
+        """Digest of text lines, independent of their order."""
+        sha1 = hashlib.sha1()
+        for line in sorted(lines):
+            sha1.update(f"{line}\n".encode())
+        return sha1.hexdigest()
+
+    @staticmethod
+    def check_fingerprint(file_path: str, fingerprint: str) -> bool:
+        """Whether the fingerprint saved alongside a cached file matches."""
+        hit = DAOUtils.read_fingerprint(file_path) == fingerprint
+        DAOUtils.count_cache("fingerprint", hit)
+        return hit
+
+    @staticmethod
+    def read_fingerprint(file_path: str) -> str:
+        """Read the fingerprint saved alongside a cached file."""
+        fingerprint_path = f"{file_path}.fingerprint"
+        if not (DAOUtils.file_exists(file_path) and DAOUtils.file_exists(fingerprint_path)):
+            return ""
+        return DAOUtils.read_file(fingerprint_path).strip()
+
+    @staticmethod
+    def write_fingerprint(file_path: str, fingerprint: str) -> bool:
+        """Save fingerprint alongside a cached file."""
+        fingerprint_path = f"{file_path}.fingerprint"
+        return DAOUtils.write_file_bytes(fingerprint_path, fingerprint.encode("utf-8"))
+
+
+    ###################
+    ## Journal Utils ##
+    ###################
+    @staticmethod
+    def append_journal(file_path: str, records: list[list[str]]) -> bool:
+        """Append tab separated records to a journal and flush them to disk."""
+        try:
+            with open(file_path, "a", encoding="utf-8", newline="\n") as f:
+                f.writelines("\t".join(record) + "\n" for record in records)
+                f.flush()
+                os.fsync(f.fileno())
+            return True
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to append to journal {file_path}: {e}")
+            return False
+
+    @staticmethod
+    def read_journal(file_path: str) -> list[list[str]]:
+        """Read complete records from a journal, skipping a torn final line."""
+        records: list[list[str]] = []
+        if not DAOUtils.file_exists(file_path):
+            return records
+        try:
+            with open(file_path, "r", encoding="utf-8", newline="\n") as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        records.append(line[:-1].split("\t"))
+        except (OSError, UnicodeDecodeError) as e:
+            DAOUtils.log_message(f"Failed to read journal {file_path}: {e}")
+        return records
+
+    @staticmethod
+    def write_journal(file_path: str, records: list[list[str]]) -> bool:
+        """Replace a journal with the given records, atomically."""
+        tmp_path = f"{file_path}.mo2tmp"
+        if not DAOUtils.make_dirs(os.path.dirname(file_path)):
+            return False
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+                f.writelines("\t".join(record) + "\n" for record in records)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+            return True
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to write journal {file_path}: {e}")
+            DAOUtils.remove_file(tmp_path)
+            return False
+
+    ####################
+    ## Manifest Utils ##
+    ####################
+
+    # Manifest.xml locations, keyed by casefolded search dir -> (dir mtime, paths)
+    _manifest_index: ClassVar[dict[str, tuple[int, list[str]]]] = {}
+
+    @staticmethod
+    def clear_manifest_index() -> None:
+        """Invalidate the manifest index (call on mod or DLC changes)."""
+        DAOUtils._manifest_index.clear()
+
+    @staticmethod
+    def search_manifests(dir_name: str) -> list[str]:
+        """Return paths of <dir_name>/<uid>/Manifest.xml, using the manifest index."""
+        key = DAOUtils.os_path_casefold(dir_name)
+        # Adding or removing a <uid> dir also updates the mtime of dir_name
+        try:
+            mtime = os.stat(dir_name).st_mtime_ns
+        except OSError:
+            return []
+        cached = DAOUtils._manifest_index.get(key)
+        hit = cached is not None and cached[0] == mtime
+        DAOUtils.count_cache("manifest_index", hit)
+        if hit:
+            return list(cached[1])
+        paths = DAOUtils._index_manifests(dir_name)
+        DAOUtils._manifest_index[key] = (mtime, paths)
+        return list(paths)
+
+    @staticmethod
+    def search_vfs_manifests(organizer: mobase.IOrganizer, search_path: str) -> list[str]:
+        """Return real paths of <search_path>/<uid>/Manifest.xml in the VFS, using the manifest index."""
+        key = f"<vfs>/{search_path.casefold()}"
+        cached = DAOUtils._manifest_index.get(key)
+        DAOUtils.count_cache("manifest_index", cached is not None)
+        if cached is not None:
+            return list(cached[1])
+        paths: list[str] = []
+        vfs_tree = organizer.virtualFileTree()
+        search_tree = vfs_tree.find(search_path, mobase.IFileTree.FileTypes.DIRECTORY)
+        if isinstance(search_tree, mobase.IFileTree):
+            for path in DAOUtils.search_filetree_manifests(search_tree):
+                paths.append(DAOUtils.resolve_path(organizer, path))
+        paths.sort(key = DAOUtils.natural_sort_key)
+        DAOUtils._manifest_index[key] = (0, paths)
+        return list(paths)
+
+    @staticmethod
+    def _index_manifests(dir_name: str) -> list[str]:
+        """Find manifests at their fixed depth, without walking the whole dir."""
+        paths: list[str] = []
+        try:
+            with os.scandir(dir_name) as uid_dirs:
+                for uid_dir in uid_dirs:
+                    if not uid_dir.is_dir():
+                        continue
+                    with os.scandir(uid_dir.path) as files:
+                        for file in files:
+                            if file.name.casefold() == "manifest.xml" and file.is_file():
+                                paths.append(DAOUtils.os_path(file.path))
+                                break
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to index manifests in {dir_name}: {e}")
+        paths.sort(key = DAOUtils.natural_sort_key)
+        return paths
+
     ###############
     ## XML Utils ##
     ###############
     @staticmethod 
     def format_xml_file(xml_path: str) -> bool:
         """Rewrite XML file with formatted content."""
-        xml_text = DAOUtils.read_file(xml_path)
-        
-        pretty_text = DAOUtils.pretty_format_xml(xml_text, "  ")
-        if not pretty_text:
+        try:
+            parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True, insert_pis=True))
+            root = ET.parse(xml_path, parser).getroot()
+        except (OSError, ET.ParseError) as e:
+            DAOUtils.log_message(f"Failed to parse xml: {e}")
             return False
-
-        return DAOUtils.write_file_bytes(xml_path, pretty_text)
+        return DAOUtils.write_xml_file(xml_path, root)
        
     @staticmethod 
     def pretty_format_xml(xml_text: str, xml_indent: str = "  ") -> bytes:
@@ -428,6 +885,77 @@ class DAOUtils:
             DAOUtils.log_message(f"Failed to parse xml: {e}")
             return "".encode('utf-8')
 
+    @staticmethod
+    def write_xml_file(file_path: str, root: ET.Element, xml_indent: str = "  ") -> bool:
+        """Write ET element to file with consistent indentation, replacing the file atomically."""
+        # Namespaced trees still need ET to assign prefixes
+        if any(
+            (isinstance(elem.tag, str) and "{" in elem.tag) or any("{" in key for key in elem.attrib)
+            for elem in root.iter()
+        ):
+            with DAOUtils.timed("xml.generated"):
+                xml_bytes = DAOUtils.pretty_format_xml(ET.tostring(root, encoding="unicode"), xml_indent)
+                return bool(xml_bytes) and DAOUtils.write_file_bytes(file_path, xml_bytes)
+        if not DAOUtils.make_dirs(os.path.dirname(file_path)):
+            return False
+        temp_path = f"{file_path}.mo2tmp"
+        start = time.perf_counter()
+        try:
+            with open(temp_path, "w", encoding="utf-8", errors="xmlcharrefreplace", newline="\n") as f:
+                f.write('<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n')
+                DAOUtils._write_xml_element(f, root, "", xml_indent)
+            os.replace(temp_path, file_path)
+            DAOUtils._record_file_op("written", start, os.path.getsize(file_path))
+            DAOUtils.observe("xml.generated", (time.perf_counter() - start) * 1000)
+            return True
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to write xml file {file_path}: {e}")
+            DAOUtils.remove_file(temp_path)
+            return False
+
+    @staticmethod
+    def _write_xml_element(f: TextIO, elem: ET.Element, indent: str, xml_indent: str) -> None:
+        """Write element in one pass, matching the layout of minidom's toprettyxml."""
+        if elem.tag is ET.Comment:
+            f.write(f"{indent}<!--{elem.text or ""}-->\n")
+            return
+        if elem.tag is ET.ProcessingInstruction:
+            target, _, data = (elem.text or "").partition(" ")
+            f.write(f"{indent}<?{target} {data}?>\n")
+            return
+        f.write(f"{indent}<{elem.tag}")
+        f.writelines(f' {name}="{DAOUtils._escape_xml(value)}"' for name, value in elem.attrib.items())
+        # Whitespace-only text is dropped, same as the razed minidom output
+        nodes: list[ET.Element | str] = []
+        if elem.text and not elem.text.isspace():
+            nodes.append(elem.text)
+        for child in elem:
+            nodes.append(child)
+            if child.tail and not child.tail.isspace():
+                nodes.append(child.tail)
+        if not nodes:
+            f.write("/>\n")
+            return
+        if len(nodes) == 1 and isinstance(nodes[0], str):
+            f.write(f">{DAOUtils._escape_xml(nodes[0])}</{elem.tag}>\n")
+            return
+        f.write(">\n")
+        child_indent = f"{indent}{xml_indent}"
+        for node in nodes:
+            if isinstance(node, str):
+                f.write(f"{child_indent}{DAOUtils._escape_xml(node)}\n")
+            else:
+                DAOUtils._write_xml_element(f, node, child_indent, xml_indent)
+        f.write(f"{indent}</{elem.tag}>\n")
+
+    @staticmethod
+    def _escape_xml(text: str) -> str:
+        """Escape text and attribute values."""
+        return (
+            text.replace("&", "&amp;").replace("<", "&lt;")
+            .replace('"', "&quot;").replace(">", "&gt;")
+        )
+
     @staticmethod
     def overwrite_element(old_elem: ET.Element, new_elem: ET.Element) -> bool:
         """Fully overwrite an ElementTree element in-place."""
@@ -457,6 +985,485 @@ class DAOUtils:
             DAOUtils.log_message(f"Failed to read xml file {file_path}: {e}")
             return None   
 
+    #################
+    ## Trace Utils ##
+    #################
+    TRACE_DIR = r"logs\dao_traces"
+    TRACE_KEEP = 20
+
+    # Chrome trace events being collected, None while tracing is off
+    _trace_events: list[dict[str, Any]] | None = None
+    _trace_origin: int = 0
+    _trace_lock = threading.Lock()
+    # Per thread stack of [files, bytes] counters for the open stages
+    _trace_local = threading.local()
+
+    @staticmethod
+    def start_trace() -> None:
+        """Start collecting stage timings."""
+        with DAOUtils._trace_lock:
+            DAOUtils._trace_events = []
+            DAOUtils._trace_origin = time.perf_counter_ns()
+
+    @staticmethod
+    @contextmanager
+    def trace_stage(name: str) -> Iterator[None]:
+        """Time a stage, counting files touched and bytes moved on this thread."""
+        if DAOUtils._trace_events is None:
+            yield
+            return
+        stack: list[list[int]] = DAOUtils._trace_local.__dict__.setdefault("stack", [])
+        counters = [0, 0]
+        stack.append(counters)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            stack.pop()
+            if stack:
+                stack[-1][0] += counters[0]
+                stack[-1][1] += counters[1]
+            event = {
+                "name": name, "cat": "dao", "ph": "X",
+                "ts": (start - DAOUtils._trace_origin) / 1000, "dur": (end - start) / 1000,
+                "pid": os.getpid(), "tid": threading.get_ident(),
+                "args": {"files": counters[0], "bytes": counters[1], "depth": len(stack)},
+            }
+            with DAOUtils._trace_lock:
+                if DAOUtils._trace_events is not None:
+                    DAOUtils._trace_events.append(event)
+
+    @staticmethod
+    @contextmanager
+    def trace(trace_name: str, enabled: bool = True) -> Iterator[None]:
+        """Collect stage timings while the block runs, the trace is stopped even if it raises."""
+        if enabled:
+            DAOUtils.start_trace()
+        try:
+            yield
+        finally:
+            if enabled:
+                DAOUtils.stop_trace(trace_name)
+
+    @staticmethod
+    def stop_trace(trace_name: str) -> None:
+        """Stop collecting, write a Chrome trace file and log a one-line summary."""
+        with DAOUtils._trace_lock:
+            events = DAOUtils._trace_events
+            DAOUtils._trace_events = None
+        if not events:
+            return
+        total = max(e["ts"] + e["dur"] for e in events) - min(e["ts"] for e in events)
+        stages = [
+            f"{e["name"]} {e["dur"] / 1000:.0f} ms ({e["args"]["files"]} files, {e["args"]["bytes"] / 1048576:.1f} MB)"
+            for e in sorted(events, key=lambda e: e["ts"]) if e["args"]["depth"] == 0
+        ]
+        DAOUtils.log_message(f"Trace {trace_name}: {total / 1000:.0f} ms total | {" | ".join(stages)}")
+        trace_dir = DAOUtils.os_path(DAOUtils.TRACE_DIR)
+        trace_path = DAOUtils.os_path(trace_dir, f"{trace_name}_{time.strftime("%Y%m%d_%H%M%S")}.json")
+        data = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if DAOUtils.write_file_bytes(trace_path, json.dumps(data, indent=1).encode("utf-8")):
+            DAOUtils.prune_files(trace_dir, ".json", DAOUtils.TRACE_KEEP)
+
+    @staticmethod
+    def prune_files(dir_name: str, ext: str, keep: int) -> None:
+        """Remove all but the newest files with the given extension."""
+        try:
+            with os.scandir(dir_name) as entries:
+                files = [e for e in entries if e.is_file() and e.name.casefold().endswith(ext)]
+        except OSError:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime_ns, reverse=True)
+        for entry in files[keep:]:
+            DAOUtils.remove_file(entry.path)
+
+    @staticmethod
+    def _record_file_op(op: str, start: float, byte_count: int = 0) -> None:
+        """Count a file operation in the metrics and against the innermost open stage on this thread."""
+        DAOUtils.observe(f"files.{op}", (time.perf_counter() - start) * 1000)
+        if byte_count:
+            DAOUtils.count("bytes.written", byte_count)
+        stack: list[list[int]] | None = DAOUtils._trace_local.__dict__.get("stack")
+        if stack:
+            stack[-1][0] += 1
+            stack[-1][1] += byte_count
+
+    ##################
+    ## Metric Utils ##
+    ##################
+    METRIC_DIR = r"logs\dao_metrics"
+    # Upper bounds of the histogram buckets in ms, anything slower goes in a last bucket
+    METRIC_BUCKETS = (1, 5, 25, 100, 500, 2500)
+
+    _metric_lock = threading.Lock()
+    _counters: ClassVar[dict[str, int]] = {}
+    # Histograms, keyed by name -> [count, total ms, min ms, max ms, *bucket counts]
+    _histograms: ClassVar[dict[str, list[float]]] = {}
+
+    @staticmethod
+    def count(name: str, value: int = 1) -> None:
+        """Add value to a counter."""
+        with DAOUtils._metric_lock:
+            DAOUtils._counters[name] = DAOUtils._counters.get(name, 0) + value
+
+    @staticmethod
+    def count_cache(name: str, hit: bool) -> None:
+        """Count a cache lookup as a hit or a miss."""
+        DAOUtils.count(f"cache.{name}.{"hit" if hit else "miss"}")
+
+    @staticmethod
+    def observe(name: str, ms: float) -> None:
+        """Add a duration in ms to a histogram."""
+        bucket = 4 + len(DAOUtils.METRIC_BUCKETS)
+        for index, bound in enumerate(DAOUtils.METRIC_BUCKETS):
+            if ms <= bound:
+                bucket = 4 + index
+                break
+        with DAOUtils._metric_lock:
+            hist = DAOUtils._histograms.get(name)
+            if hist is None:
+                hist = [0, 0.0, ms, ms] + [0] * (len(DAOUtils.METRIC_BUCKETS) + 1)
+                DAOUtils._histograms[name] = hist
+            hist[0] += 1
+            hist[1] += ms
+            hist[2] = min(hist[2], ms)
+            hist[3] = max(hist[3], ms)
+            hist[bucket] += 1
+
+    @staticmethod
+    @contextmanager
+    def timed(name: str) -> Iterator[None]:
+        """Add the duration of the block to a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            DAOUtils.observe(name, (time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def resolve_path(organizer: mobase.IOrganizer, path: str) -> str:
+        """Resolve a VFS path to its real path, timing the call."""
+        with DAOUtils.timed("vfs.resolve_path"):
+            return organizer.resolvePath(path)
+
+    @staticmethod
+    def get_metrics() -> dict[str, Any]:
+        """Snapshot of all counters and histograms."""
+        labels = [f"<={bound} ms" for bound in DAOUtils.METRIC_BUCKETS]
+        labels.append(f">{DAOUtils.METRIC_BUCKETS[-1]} ms")
+        with DAOUtils._metric_lock:
+            counters = dict(sorted(DAOUtils._counters.items()))
+            hists = {name: list(hist) for name, hist in sorted(DAOUtils._histograms.items())}
+        histograms = {
+            name: {
+                "count": int(hist[0]),
+                "total_ms": round(hist[1], 3),
+                "mean_ms": round(hist[1] / hist[0], 3),
+                "min_ms": round(hist[2], 3),
+                "max_ms": round(hist[3], 3),
+                "buckets": dict(zip(labels, map(int, hist[4:]), strict=True)),
+            }
+            for name, hist in hists.items()
+        }
+        return {
+            "plugin": getattr(DAOUtils, "_plugin_name", ""),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    @staticmethod
+    def reset_metrics() -> None:
+        """Clear all counters and histograms."""
+        with DAOUtils._metric_lock:
+            DAOUtils._counters.clear()
+            DAOUtils._histograms.clear()
+
+    @staticmethod
+    def get_metrics_path() -> str:
+        """Dump file of this copy of DAOUtils, so the game and tools plugins do not collide."""
+        return DAOUtils.os_path(DAOUtils.METRIC_DIR, f"{DAOUtils.__module__}.json")
+
+    # Serializes dumps, which share one temp file per path
+    _dump_lock = threading.Lock()
+
+    @staticmethod
+    def dump_metrics(file_path: str = "") -> bool:
+        """Write the metrics snapshot to JSON, replacing the file atomically."""
+        file_path = file_path or DAOUtils.get_metrics_path()
+        tmp_path = f"{file_path}.mo2tmp"
+        # Written directly, so dumping does not count towards the file metrics
+        try:
+            with DAOUtils._dump_lock:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(DAOUtils.get_metrics(), f, indent=1)
+                os.replace(tmp_path, file_path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            DAOUtils.log_message(f"Failed to write metrics {file_path}: {e}")
+            return False
+
+    @staticmethod
+    def read_metrics_dumps() -> dict[str, dict[str, Any]]:
+        """Read every metrics dump in the metrics dir, keyed by file path."""
+        dumps: dict[str, dict[str, Any]] = {}
+        metric_dir = DAOUtils.os_path(DAOUtils.METRIC_DIR)
+        try:
+            with os.scandir(metric_dir) as entries:
+                paths = sorted(e.path for e in entries if e.is_file() and e.name.casefold().endswith(".json"))
+        except OSError:
+            return dumps
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    dumps[DAOUtils.os_path(path)] = json.load(f)
+            except (OSError, ValueError) as e:
+                DAOUtils.log_message(f"Failed to read metrics {path}: {e}")
+        return dumps
+
+    ###################
+    ## Profile Utils ##
+    ###################
+    PROFILE_DIR = r"logs\dao_profiles"
+    PROFILE_KEEP = 20
+
+    # Only one profiler can be active at a time
+    _profile_lock = threading.Lock()
+
+    @staticmethod
+    def entry_point(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Time and watch the wrapped plugin method, profiling it when the plugin's enable_profiling setting is on."""
+        @functools.wraps(func)
+        def wrapper(plugin: Any, *args: Any, **kwargs: Any) -> Any:
+            name = f"{type(plugin).__name__}.{func.__name__}"
+            threshold = DAOUtils._get_plugin_setting(plugin, "stall_threshold_ms")
+            with DAOUtils.timed(f"entry.{name}"), DAOUtils.watch_stalls(name, int(threshold or 0)):
+                if not DAOUtils._is_profiling(plugin):
+                    return func(plugin, *args, **kwargs)
+                # Nested or concurrent entry points run unprofiled
+                if not DAOUtils._profile_lock.acquire(blocking=False):
+                    return func(plugin, *args, **kwargs)
+                try:
+                    return DAOUtils._run_profiled(name, func, plugin, *args, **kwargs)
+                finally:
+                    DAOUtils._profile_lock.release()
+        return wrapper
+
+    @staticmethod
+    def saves_metrics(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Dump the metrics once the wrapped handler returns, for handlers that end an install, launch or run."""
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                DAOUtils.dump_metrics()
+        return wrapper
+
+    @staticmethod
+    def _is_profiling(plugin: Any) -> bool:
+        """Whether the plugin's enable_profiling setting is on."""
+        return bool(DAOUtils._get_plugin_setting(plugin, "enable_profiling"))
+
+    @staticmethod
+    def _get_plugin_setting(plugin: Any, key: str) -> Any:
+        """Read a setting through the plugin's own setting getter, None if it has none."""
+        get_setting = getattr(plugin, "_get_setting", None) or getattr(plugin, "get_setting", None)
+        try:
+            return get_setting(key) if get_setting else None
+        except (RuntimeError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _run_profiled(name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func under cProfile and tracemalloc, then dump the results."""
+        profiler = cProfile.Profile()
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+        finally:
+            elapsed = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracemalloc:
+                tracemalloc.stop()
+            DAOUtils._dump_profile(name, profiler, snapshot, elapsed, peak)
+
+    @staticmethod
+    def _dump_profile(name: str, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot, elapsed: float, peak: int) -> None:
+        """Write pstats and a readable report with the top allocations to the profile dir."""
+        profile_dir = DAOUtils.os_path(DAOUtils.PROFILE_DIR)
+        stamp = f"{time.strftime("%Y%m%d_%H%M%S")}_{time.time_ns() // 1000000 % 1000:03d}"
+        base_path = DAOUtils.os_path(profile_dir, f"{name}_{stamp}")
+        if not DAOUtils.make_dirs(profile_dir):
+            return
+        try:
+            profiler.dump_stats(f"{base_path}.prof")
+            with open(f"{base_path}.txt", "w", encoding="utf-8") as f:
+                f.write(f"{name}: {elapsed * 1000:.0f} ms, peak traced memory {peak / 1048576:.1f} MB\n\n")
+                stats = pstats.Stats(profiler, stream=f)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+                f.write("Top allocations:\n")
+                f.writelines(f"{stat}\n" for stat in snapshot.statistics("lineno")[:25])
+        except OSError as e:
+            DAOUtils.log_message(f"Failed to write profile {base_path}: {e}")
+            return
+        DAOUtils.log_message(f"Profiled {name}: {elapsed * 1000:.0f} ms, saved to {base_path}.txt")
+        DAOUtils.prune_files(profile_dir, ".prof", DAOUtils.PROFILE_KEEP)
+        DAOUtils.prune_files(profile_dir, ".txt", DAOUtils.PROFILE_KEEP)
+
+    ####################
+    ## Watchdog Utils ##
+    ####################
+    # Seconds between stack samples of a stalled thread
+    WATCHDOG_INTERVAL = 0.05
+    # Seconds between reports while a stall lasts, so a freeze that gets killed still leaves a log
+    STALL_REPORT_INTERVAL = 5.0
+
+    _watch_lock = threading.Lock()
+    # Watched calls, keyed by id -> {name, ident, start, threshold, stacks, reported}
+    _watched: ClassVar[dict[int, dict[str, Any]]] = {}
+    _watchdog: threading.Thread | None = None
+
+    @staticmethod
+    @contextmanager
+    def watch_stalls(name: str, threshold_ms: int) -> Iterator[None]:
+        """Sample this thread's stack while the block runs longer than threshold_ms, logging the hot frames as it goes and on return."""
+        ident = threading.get_ident()
+        with DAOUtils._watch_lock:
+            # Nested calls are covered by the outermost watch on this thread
+            if threshold_ms <= 0 or any(w["ident"] == ident for w in DAOUtils._watched.values()):
+                watch = None
+            else:
+                watch = {
+                    "name": name, "ident": ident, "start": time.perf_counter(),
+                    "threshold": threshold_ms / 1000, "stacks": Counter(), "reported": None,
+                }
+                DAOUtils._watched[id(watch)] = watch
+                if DAOUtils._watchdog is None:
+                    DAOUtils._watchdog = threading.Thread(target=DAOUtils._watchdog_loop, name="dao_watchdog", daemon=True)
+                    DAOUtils._watchdog.start()
+        if watch is None:
+            yield
+            return
+        try:
+            yield
+        finally:
+            with DAOUtils._watch_lock:
+                DAOUtils._watched.pop(id(watch), None)
+            if watch["stacks"]:
+                DAOUtils._report_stall(watch, time.perf_counter() - watch["start"])
+
+    @staticmethod
+    def _watchdog_loop() -> None:
+        """Sample the stacks of stalled threads, exiting once nothing is watched."""
+        while True:
+            time.sleep(DAOUtils.WATCHDOG_INTERVAL)
+            now = time.perf_counter()
+            with DAOUtils._watch_lock:
+                if not DAOUtils._watched:
+                    DAOUtils._watchdog = None
+                    return
+                stalled = [w for w in DAOUtils._watched.values() if now - w["start"] >= w["threshold"]]
+            if not stalled:
+                continue
+            frames = sys._current_frames()
+            for watch in stalled:
+                frame = frames.get(watch["ident"])
+                if frame is None:
+                    continue
+                # Innermost frame first
+                stack = tuple(
+                    (os.path.basename(f.f_code.co_filename), line, f.f_code.co_name)
+                    for f, line in traceback.walk_stack(frame)
+                )
+                with DAOUtils._watch_lock:
+                    if id(watch) not in DAOUtils._watched:
+                        continue
+                    watch["stacks"][stack] += 1
+                    due = watch["reported"] is None or now - watch["reported"] >= DAOUtils.STALL_REPORT_INTERVAL
+                    if due:
+                        watch["reported"] = now
+                        stacks = Counter(watch["stacks"])
+                if due:
+                    DAOUtils._report_stall({**watch, "stacks": stacks}, now - watch["start"], True)
+            del frames
+
+    @staticmethod
+    def _report_stall(watch: dict[str, Any], elapsed: float, ongoing: bool = False) -> None:
+        """Log where a stalled call spent (or is still spending) its time, from the collected stack samples."""
+        stacks: Counter[tuple[tuple[str, int, str], ...]] = watch["stacks"]
+        total = sum(stacks.values())
+        if ongoing:
+            header = f"Stall: {watch["name"]} has held its thread for {elapsed * 1000:.0f} ms so far ({total} samples). Hot frames:"
+        else:
+            DAOUtils.observe(f"stall.{watch["name"]}", elapsed * 1000)
+            header = f"Stall: {watch["name"]} held its thread for {elapsed * 1000:.0f} ms ({total} samples). Hot frames:"
+        leaves: Counter[tuple[str, int, str]] = Counter()
+        for stack, samples in stacks.items():
+            if stack:
+                leaves[stack[0]] += samples
+        lines = [header]
+        for (file, line, func), samples in leaves.most_common(5):
+            lines.append(f"  {samples * 100 / total:5.1f}% {func} ({file}:{line})")
+        hottest, samples = stacks.most_common(1)[0]
+        lines.append(f"Hottest stack ({samples * 100 / total:.1f}%), innermost last:")
+        for file, line, func in reversed(hottest):
+            lines.append(f"  {func} ({file}:{line})")
+        DAOUtils.log_message("\n".join(lines))
+
+    ##################
+    ## Thread Utils ##
+    ##################
+    @staticmethod
+    def run_stages(stages: dict[str, tuple[Callable[[], bool], tuple[str, ...]]], max_workers: int = 3) -> dict[str, bool]:
+        """Run stages concurrently, each once its dependencies have succeeded. Return result per stage."""
+        results: dict[str, bool] = {}
+        pending = dict(stages)
+        running: dict[Future[bool], str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dao_stage") as pool:
+            while pending or running:
+                ready = [name for name, (_, deps) in pending.items() if all(dep in results for dep in deps)]
+                for name in ready:
+                    func, deps = pending.pop(name)
+                    failed = [dep for dep in deps if not results[dep]]
+                    if failed:
+                        DAOUtils.log_message(f"Skipping stage {name}, failed dependencies: {", ".join(failed)}.")
+                        results[name] = False
+                        continue
+                    running[pool.submit(DAOUtils._run_stage, name, func)] = name
+                if not running:
+                    if ready:
+                        continue
+                    for name in pending:
+                        DAOUtils.log_message(f"Skipping stage {name}, unresolved dependencies.")
+                        results[name] = False
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        return results
+
+    @staticmethod
+    def _run_stage(name: str, func: Callable[[], bool]) -> bool:
+        """Run a single stage, treating exceptions as failure."""
+        # A failing stage must not abort the others, whatever it raised
+        try:
+            with DAOUtils.trace_stage(name):
+                return bool(func())
+        except Exception as e:  # noqa: BLE001
+            DAOUtils.log_message(f"Stage {name} failed: {e}")
+            return False
+
     #################
     ## Misc. Utils ##
     #################
@@ -466,9 +1473,28 @@ class DAOUtils:
         s = data.decode(encoding, errors="ignore")
         return s.rstrip("\0")
 
+    # ERF table of contents, keyed by casefolded path -> ((size, mtime), names)
+    _erf_cache: ClassVar[dict[str, tuple[tuple[int, int], list[str]]]] = {}
+
     @staticmethod
     def get_erf_paths(name: str, file_path: str) -> list[str]:
-        """List files inside a DAO .erf archive."""
+        """List files inside a DAO .erf archive, reusing the list if file is unchanged."""
+        key = file_path.casefold()
+        stamp = DAOUtils.get_file_stamp(file_path)
+        cached = DAOUtils._erf_cache.get(key)
+        hit = stamp is not None and cached is not None and cached[0] == stamp
+        DAOUtils.count_cache("erf", hit)
+        if hit:
+            return list(cached[1])
+        with DAOUtils.timed("erf.parsed"):
+            file_list = DAOUtils._read_erf_toc(file_path)
+        if stamp is not None and file_list is not None:
+            DAOUtils._erf_cache[key] = (stamp, file_list)
+        return list(file_list or [])
+
+    @staticmethod
+    def _read_erf_toc(file_path: str) -> list[str] | None:
+        """Read the file list of an .erf archive in one pass, None on failure."""
         file_list: list[str] = []
         try:
             with open(file_path, "rb") as f:
@@ -478,21 +1504,21 @@ class DAOUtils:
                 version = DAOUtils.decode_bytes(hdr1[8:16], "utf-16le")
                 if file_type != "ERF " or version not in ("V2.0", "V2.2"):
                     DAOUtils.log_message(f"ERF version not supported {file_type} {version}")
-                    f.close()
                     return file_list
                 # Header2 16-32 
                 hdr2 = f.read(16)
                 file_count, _, _, _ = struct.unpack("<4I", hdr2)
-                # File List
-                for _ in range(file_count):
-                    entry_size = 76 if version == "V2.2" else 72
-                    entry_data = f.read(entry_size)
-                    name = DAOUtils.decode_bytes(entry_data[0:64], "utf-16le")
-                    if not name:
-                        continue
-                    file_list.append(name.casefold())
+                # File List, read in a single block
+                entry_size = 76 if version == "V2.2" else 72
+                toc = f.read(file_count * entry_size)
         except Exception as e:
             DAOUtils.log_message(f"Failed to read ERF file {file_path}: {e}")
+            return None
+        for offset in range(0, len(toc) - entry_size + 1, entry_size):
+            name = DAOUtils.decode_bytes(toc[offset:offset + 64], "utf-16le")
+            if not name:
+                continue
+            file_list.append(name.casefold())
         file_list.sort(key=DAOUtils.natural_sort_key)
         return file_list 
     
@@ -531,16 +1557,9 @@ class DAOUtils:
     
     @staticmethod
     def validate_checksum(target_path: str, checksum: str) -> bool:
-        """Uses file checksum to validate file"""
-        sha256 = hashlib.sha256()
-        try:
-            with open(target_path, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    sha256.update(chunk)
-            if sha256.hexdigest() != checksum:
-                DAOUtils.log_message(f"Failed to validate: {target_path}")
-                return False
-            return True
-        except Exception as e:
-            DAOUtils.log_message(f"Failed to validate: {target_path}: {e}")
-            return False
\ No newline at end of file
+        """Uses file checksum (sha256) to validate file, reusing the digest if file is unchanged"""
+        digest = DAOUtils.hash_file(target_path, "sha256")
+        if not digest or digest != checksum.strip().casefold():
+            DAOUtils.log_message(f"Failed to validate: {target_path}")
+            return False
+        return True
\ No newline at end of file
@@ -1,6 +1,7 @@
 import mobase
 
 from pathlib import Path
+from typing import Callable
 from xml.etree import ElementTree as ET
 
 from PyQt6.QtWidgets import QMainWindow
@@ -49,6 +50,10 @@ class DAOriginsGame(BasicGame):
         organizer.onPluginSettingChanged(self._handle_plugin_setting_changed)
         organizer.downloadManager().onDownloadComplete(self._handle_downloadComplete)
         organizer.modList().onModInstalled(self._handle_modInstalled)
+        organizer.modList().onModRemoved(self._handle_modlist_changed)
+        organizer.modList().onModStateChanged(self._handle_modlist_changed)
+        organizer.modList().onModMoved(self._handle_modlist_changed)
+        organizer.onProfileChanged(self._handle_modlist_changed)
         organizer.onAboutToRun(self._handle_aboutToRun)
         organizer.onFinishedRun(self._handle_finishedRun)
         organizer.onUserInterfaceInitialized(self._handle_user_interface_initialized)
@@ -117,6 +122,21 @@ class DAOriginsGame(BasicGame):
         "enable_logging" : (
             f"Toggles message logging to console (logs/mo_interface.log).<br><br>"
         ),
+        "enable_profiling" : (
+            "Profiles plugin entry points (installs, downloads, game launch/exit)."
+            "<br><br>Saves cProfile stats and top memory allocations to logs/dao_profiles."
+            "<br><br>Slows MO2 down, only enable when reporting an issue.<br><br>"
+        ),
+        "enable_tracing" : (
+            "Times each game launch and exit stage (files touched, bytes moved)."
+            "<br><br>Writes a summary to the log and a Chrome trace to logs/dao_traces."
+            "<br><br>Open traces in chrome://tracing or ui.perfetto.dev.<br><br>"
+        ),
+        "stall_threshold_ms" : (
+            "Logs the hot stack frames when a plugin handler blocks MO2 for longer than this (ms)."
+            "<br><br>A watchdog samples the blocked thread's stack while the stall lasts."
+            "<br><br>Set to 0 to disable.<br><br>"
+        ),
         "flatten_override" : (
             f"Removes all sub-directories from packages/core/override."
             f"<br><br>Files will be placed directly in the override directory."
@@ -134,6 +154,18 @@ class DAOriginsGame(BasicGame):
             f"<br><br>Allows for binaries/load libraries to be managed from MO2."
             f"<br><br>(E.g, patched DAOrigins.exe, DXVK, DAFIX ).<br><br>"
         ),
+        "link_bin_ship" : (
+            "Used when deploy_bin_ship is active."
+            "<br><br>Deploys bin_ship binaries (.asi, .dll, .exe) as hard-links (or symlinks) to the mod folder instead of copies."
+            "<br><br>Other files (e.g. .ini configs) are still copied, so changes to them do not reach the mod folder."
+            "<br><br>Falls back to copying when links are not possible (e.g, different drives).<br><br>"
+        ),
+        "keep_bin_ship_deployed" : (
+            "Used when deploy_bin_ship is active."
+            "<br><br>Leaves deployed bin_ship files in place when the game stops."
+            "<br><br>Only added, removed or changed files are updated at the next launch."
+            "<br><br>Disable to restore game root bin_ship to its original state.<br><br>"
+        ),
         "build_addins_offers_xml" : (
             f"Dynamically builds Addins.xml and Offers.xml files on game launch."
             f"<br><br>Results based on installed DLC and other dazip mods."
@@ -142,8 +174,15 @@ class DAOriginsGame(BasicGame):
         "build_chargenmorphcfg_xml" : (
             f"Dynamically builds Chargenmorphcfg.xml file on game launch."
             f"<br><br>Results based on mods found in packages/core/overrides."
+            f"<br><br>Competing Chargenmorphcfg.xml files stay hidden while enabled."
             f"<br><br>Disable to manually manage Chargenmorphcfg.xml.<br><br>"
         ),
+        "override_config_mode" : (
+            "How OverrideConfig.xml options of .override packages are chosen on install."
+            "<br><br>Prompt: ask for each option, preselecting the last choice for that package."
+            "<br><br>Batch: no prompts, apply the last choice for that package or else the default."
+            "<br><br>Choices are saved in DAO_OverridePresets.json.<br><br>"
+        ),
         "inject_fomod_scripts" : (
             f"Repackages select mods with fomod install scripts on download."
             f"<br><br>Hopefully coverage will grow over time..."
@@ -161,6 +200,21 @@ class DAOriginsGame(BasicGame):
                 self._setting_descriptions["enable_logging"],
                 True,
             ),
+            mobase.PluginSetting(
+                "enable_profiling",
+                self._setting_descriptions["enable_profiling"],
+                False,
+            ),
+            mobase.PluginSetting(
+                "enable_tracing",
+                self._setting_descriptions["enable_tracing"],
+                False,
+            ),
+            mobase.PluginSetting(
+                "stall_threshold_ms",
+                self._setting_descriptions["stall_threshold_ms"],
+                1000,
+            ),
             mobase.PluginSetting(
                 "flatten_override",
                 self._setting_descriptions["flatten_override"],
@@ -176,6 +230,16 @@ class DAOriginsGame(BasicGame):
                 self._setting_descriptions["deploy_bin_ship"],
                 True,
             ),
+            mobase.PluginSetting(
+                "link_bin_ship",
+                self._setting_descriptions["link_bin_ship"],
+                True,
+            ),
+            mobase.PluginSetting(
+                "keep_bin_ship_deployed",
+                self._setting_descriptions["keep_bin_ship_deployed"],
+                False,
+            ),
             mobase.PluginSetting(
                 "build_addins_offers_xml",
                 self._setting_descriptions["build_addins_offers_xml"],
@@ -186,6 +250,11 @@ class DAOriginsGame(BasicGame):
                 self._setting_descriptions["build_chargenmorphcfg_xml"],
                 True,
             ),
+            mobase.PluginSetting(
+                "override_config_mode",
+                self._setting_descriptions["override_config_mode"],
+                "Prompt",
+            ),
             mobase.PluginSetting(
                 "inject_fomod_scripts",
                 self._setting_descriptions["inject_fomod_scripts"],
@@ -261,6 +330,7 @@ class DAOriginsGame(BasicGame):
     ####################
     ## Event Handlers ##
     ####################
+    @DAOUtils.entry_point
     def _handle_plugin_setting_changed(self, plugin: str, setting: str, old: mobase.MoVariant, new: mobase.MoVariant):
         """Event Handler for onPluginSettingChanged"""
         if self.name() != plugin or old == new:
@@ -270,6 +340,9 @@ class DAOriginsGame(BasicGame):
         if setting == "deploy_bin_ship" and new:
             # Warn of potential clash with root builder
             self._rootbuilder_warning()
+        if setting in ("deploy_bin_ship", "keep_bin_ship_deployed") and not new:
+            # Remove any deployment left in place between runs
+            DAOLaunch.undeploy_secondary_files(self._path_dict)
         if setting == "flatten_override" and new:
             if not DAOUtils.show_message_box(
                 f"Flatten packages/core/override?",
@@ -281,8 +354,15 @@ class DAOriginsGame(BasicGame):
             ): return self._set_setting(setting, False)
             mods_path = self._organizer.modsPath()
             DAOInstall.flatten_override_dir_all_mods(mods_path)         
+        if setting == "flatten_override" and not new:
+            # Mods may be reinstalled unflattened from now on, the next enable starts from scratch
+            DAOUtils.remove_file(DAOUtils.os_path(DAOInstall.FLATTEN_JOURNAL))
+        if setting == "build_chargenmorphcfg_xml" and not new:
+            # Generated Chargenmorphcfg.xml persists between launches
+            DAOLaunch.restore_chargenmorphcfg_xml(self._organizer.overwritePath())
         
     ## If download file is .dazip, rename to .zip ##
+    @DAOUtils.entry_point
     def _handle_downloadComplete(self, download_id: int) -> None:
         """Event Handler for onDownloadComplete"""
         dm = self._organizer.downloadManager()
@@ -298,28 +378,46 @@ class DAOriginsGame(BasicGame):
     # Support for .override (with override config options)
     # Flattens packages/core/override to work with MO2 built in conflict checker
     # Root builder plugin supported
+    @DAOUtils.saves_metrics
+    @DAOUtils.entry_point
     def _handle_modInstalled(self, mod: mobase.IModInterface) -> None:
         """Event Handler for onModInstalled"""
+        DAOUtils.clear_manifest_index()
         mod_name = mod.name()
         filetree = mod.fileTree()
         install_tasks = DAOInstall.queue_install_tasks(filetree)
         if not install_tasks.__len__(): 
             return
         mod_dir = mod.absolutePath()
-        if not DAOInstall.execute_install_tasks(install_tasks, mod_dir):
+        flatten = bool(self._get_setting("flatten_override"))
+        batch = str(self._get_setting("override_config_mode")).casefold() == "batch"
+        tree_files = DAOInstall.queue_tree_override_files(filetree, mod_dir) if flatten else []
+        if not DAOInstall.execute_install_tasks(install_tasks, mod_dir, flatten, batch, tree_files):
             DAOInstall.warn_install_failed(mod_name)
             return
-        if not self._get_setting("flatten_override"):
+        if not flatten:
             return
         if not DAOInstall.flatten_override_dir(mod_dir):
             DAOInstall.warn_install_failed(mod_name)
 
+    # Mod list changes can add or remove Addins/Offers manifests from the VFS
+    def _handle_modlist_changed(self, *_args: object) -> None:
+        """Event Handler for onModRemoved, onModStateChanged, onModMoved, onProfileChanged"""
+        DAOUtils.clear_manifest_index()
+
+    # Called by the DAO DLC-Manager, which adds, moves and removes DLC outside the mod list events
+    def clear_manifest_index(self) -> None:
+        """Drop the cached Addins/Offers manifest paths"""
+        DAOUtils.clear_manifest_index()
+
     # On game launch:
     # - Deploy bin_ship
     # - Build addins.xml 
     # - Build offers.xml 
-    # - Build chargenmorphcfg.xml
-    # - Reverts changes when game stops.
+    # - Build chargenmorphcfg.xml (kept between launches)
+    # - Reverts other changes when game stops.
+    @DAOUtils.saves_metrics
+    @DAOUtils.entry_point
     def _handle_aboutToRun(self, app_path: str) -> bool:
         """Event Handler for onAboutToRun""" 
         # Return false means game no launch
@@ -329,40 +427,63 @@ class DAOriginsGame(BasicGame):
         overwrite = self._organizer.overwritePath()
         DAOUtils.log_message(f"Game launch detected: {app_path}")
         show_warning = False
-        # Deploy bin files to game directory
-        if self._get_setting("deploy_bin_ship"):
-            if not DAOLaunch.deploy_secondary_files(app_path, self._path_dict, self._organizer):
+        with DAOUtils.trace("launch", bool(self._get_setting("enable_tracing"))):
+            # Launch stages -> (task, stages it depends on), run concurrently
+            # Stages run on worker threads and must not call mobase, so the VFS is resolved here first
+            stages: dict[str, tuple[Callable[[], bool], tuple[str, ...]]] = {}
+            # Deploy bin files to game directory
+            if self._get_setting("deploy_bin_ship"):
+                link = bool(self._get_setting("link_bin_ship"))
+                with DAOUtils.trace_stage("bin_ship_resolve"):
+                    sources = DAOLaunch.get_secondary_sources(self._organizer)
+                stages["bin_ship"] = (
+                    lambda: DAOLaunch.deploy_secondary_files(app_path, self._path_dict, sources, link), ())
+            # Build Addins.xml and Offers.xml
+            if self._get_setting("build_addins_offers_xml"):        
+                with DAOUtils.trace_stage("addins_offers_resolve"):
+                    manifest_paths = DAOLaunch.get_addins_offers_manifests(game_dir, self._organizer)
+                    profile_dir = DAOLaunch.get_profile_settings_dir(self._organizer)
+                stages["addins_offers"] = (
+                    lambda: DAOLaunch.build_addins_offers_xml(overwrite, manifest_paths, profile_dir), ())
+            # Build Chargenmorph.xml
+            if self._get_setting("build_chargenmorphcfg_xml"):
+                with DAOUtils.trace_stage("chargenmorphcfg_resolve"):
+                    chargen_files = DAOLaunch.get_chargen_files(self._organizer)
+                stages["chargenmorphcfg"] = (
+                    lambda: DAOLaunch.build_chargenmorphcfg_xml(overwrite, game_dir, chargen_files), ())
+            results = DAOUtils.run_stages(stages)
+            if not results.get("bin_ship", True):
                 DAOUtils.log_message(f"Warning: Failed to deploy to bin_ship dir!")
                 show_warning = True
-        # Build Addins.xml and Offers.xml
-        if self._get_setting("build_addins_offers_xml"):        
-            if not DAOLaunch.build_addins_offers_xml(overwrite, game_dir, self._organizer):
+            if not results.get("addins_offers", True):
                 DAOUtils.log_message(f"Warning: Failed to build Addins.xml and/or Offers.xml")
                 show_warning = True
-        # Build Chargenmorph.xml
-        if self._get_setting("build_chargenmorphcfg_xml"):
-            if not DAOLaunch.build_chargenmorphcfg_xml(overwrite, game_dir, self._organizer):
-                ovrd_path = "packages/core/override"
-                DAOLaunch.hide_files("chargenmorphcfg.xml", game_dir, self._organizer, ovrd_path, True)
+            if not results.get("chargenmorphcfg", True):
+                with DAOUtils.trace_stage("chargenmorphcfg_restore"):
+                    DAOLaunch.restore_chargenmorphcfg_xml(overwrite)
                 DAOUtils.log_message(f"Warning: Failed to build Chargenmorphcfg.xml")
                 show_warning = True
-        # Report any failures                
-        if show_warning:
-            DAOUtils.show_message_box(
-                header = "Warning!", 
-                message = [
-                    f"Something went wrong during game launch!<br><br>",
-                    "Please see MO2 logs for more info.",
-                ],
-                link = f"file:///{self._path_dict["base_dir"]}/logs",
-                link_name = "-- Log Directory --",
-                warning = True,
-                )
+            # Report any failures                
+            if show_warning:
+                DAOUtils.show_message_box(
+                    header = "Warning!", 
+                    message = [
+                        "Something went wrong during game launch!<br><br>",
+                        "Please see MO2 logs for more info.",
+                    ],
+                    link = f"file:///{self._path_dict["base_dir"]}/logs",
+                    link_name = "-- Log Directory --",
+                    warning = True,
+                    )
         DAOUtils.log_message(f"Launching Game...")
         return True
 
+    @DAOUtils.saves_metrics
+    @DAOUtils.entry_point
     def _handle_finishedRun(self, app_path: str, exit_code: int) -> None:
         """Event Handler for onFinishedRun"""
+        # Any app (e.g. DAUpdater) may have added or removed DLC
+        DAOUtils.clear_manifest_index()
         if not self._is_game_triggered(app_path):
             return
         overwrite = self._organizer.overwritePath()
@@ -370,43 +491,39 @@ class DAOriginsGame(BasicGame):
         profile_dir = profile.absolutePath()
         DAOUtils.log_message(f"Game stop detected: {app_path}")
         show_warning = False
-        # Restore bin files in game directory
-        if self._get_setting("deploy_bin_ship"):
-            DAOUtils.log_message(f"Recovering bin_ship to previous state.")
-            if not DAOLaunch.recover_secondary_dirs(app_path, self._path_dict, self._organizer):
-                show_warning = True
-        # Restore Addins.xml and Offers.xml
-        if self._get_setting("build_addins_offers_xml"):
-            DAOUtils.log_message(f"Restoring Addins.xml/Offers.xml.")
-            for mod_type in ("Addins", "Offers"):
-                if profile.localSettingsEnabled():
-                    link_path = DAOUtils.os_path(profile_dir, f"{mod_type}.xml")
-                    DAOUtils.log_message(f"Removing {mod_type}.xml link.")
-                    if not DAOUtils.restore_backup(link_path):
-                        if DAOUtils.remove_link(link_path, True):
-                            continue
-                        DAOUtils.log_message(f"Warning: Failed to restore profile dir: {profile_dir}.")
+        with DAOUtils.trace("exit", bool(self._get_setting("enable_tracing"))):
+            # Restore bin files in game directory
+            if self._get_setting("deploy_bin_ship"):
+                DAOUtils.log_message("Recovering bin_ship to previous state.")
+                keep_deployed = bool(self._get_setting("keep_bin_ship_deployed"))
+                with DAOUtils.trace_stage("bin_ship"):
+                    if not DAOLaunch.recover_secondary_dirs(app_path, self._path_dict, keep_deployed):
                         show_warning = True
-                xml_path = DAOUtils.os_path(overwrite, "Settings", f"{mod_type}.xml")
-                if not DAOUtils.restore_backup(xml_path):
-                    if DAOUtils.remove_file(xml_path):
-                        continue
-                    DAOUtils.log_message(f"Warning: Failed to restore overwrite dir: {overwrite}.")
-                    show_warning = True
-        # Restore Chargenmorph.xml
-        if self._get_setting("build_chargenmorphcfg_xml"):
-            ovrd_path = "packages/core/override"
-            game_dir = self.gameDirectory().absolutePath()
-            chargen_path = DAOUtils.os_path(overwrite, ovrd_path, "Chargenmorphcfg.xml")
-            DAOUtils.log_message(f"Restoring chargenmorphcfg.xml.")
-            if not DAOLaunch.hide_files("chargenmorphcfg.xml", game_dir, self._organizer, ovrd_path, True):
-                show_warning = True
-            if not DAOUtils.remove_file(chargen_path):
-                show_warning = True
-        # Move any files in the overwrite dir back to settings dir
-        DAOLaunch.move_save_game_files(profile, self._path_dict)
-        # Remove empty sub-dirs from overwrite dir           
-        DAOUtils.remove_empty_subdirs(overwrite)
+            # Restore Addins.xml and Offers.xml
+            if self._get_setting("build_addins_offers_xml"):
+                DAOUtils.log_message("Restoring Addins.xml/Offers.xml.")
+                with DAOUtils.trace_stage("addins_offers"):
+                    for mod_type in ("Addins", "Offers"):
+                        if profile.localSettingsEnabled():
+                            link_path = DAOUtils.os_path(profile_dir, f"{mod_type}.xml")
+                            DAOUtils.log_message(f"Removing {mod_type}.xml link.")
+                            if not DAOUtils.restore_backup(link_path):
+                                if DAOUtils.remove_link(link_path, True):
+                                    continue
+                                DAOUtils.log_message(f"Warning: Failed to restore profile dir: {profile_dir}.")
+                                show_warning = True
+                        xml_path = DAOUtils.os_path(overwrite, "Settings", f"{mod_type}.xml")
+                        if not DAOUtils.restore_backup(xml_path):
+                            if DAOUtils.remove_file(xml_path):
+                                continue
+                            DAOUtils.log_message(f"Warning: Failed to restore overwrite dir: {overwrite}.")
+                            show_warning = True
+            # Move any files in the overwrite dir back to settings dir
+            with DAOUtils.trace_stage("save_merge"):
+                DAOLaunch.move_save_game_files(profile, self._path_dict)
+            # Remove empty sub-dirs from overwrite dir           
+            with DAOUtils.trace_stage("overwrite_cleanup"):
+                DAOUtils.remove_empty_subdirs(overwrite)
         # Report any failures
         if show_warning:
             DAOUtils.show_message_box(
@@ -426,7 +543,8 @@ class DAOriginsGame(BasicGame):
             # Warn of potential clash with root builder
             self._rootbuilder_warning()
             # Recover bin dir if persisted bin list exists
-            DAOLaunch.check_secondary_status(self._path_dict, self._organizer)
+            keep_deployed = bool(self._get_setting("keep_bin_ship_deployed"))
+            DAOLaunch.check_secondary_status(self._path_dict, keep_deployed)
 
     # Check that the triggered app is the game itself
     def _is_game_triggered(self, app_path: str) -> bool:
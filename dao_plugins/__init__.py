@@ -2,11 +2,13 @@ import mobase
 
 from .dao_dlc_manager import DAODLCManager
 from  .dao_conflict_checker import DAOConflictChecker
+from .dao_metrics_dashboard import DAOMetricsDashboard
 from .dao_utils import DAOUtils
 
 __all__ = [
     "DAODLCManager",
     "DAOConflictChecker",
+    "DAOMetricsDashboard",
     "DAOUtils",
 ]
 
@@ -14,4 +16,5 @@ def createPlugins() -> list[mobase.IPlugin]:
     return [
         DAODLCManager(),
         DAOConflictChecker(),
+        DAOMetricsDashboard(),
     ]
@@ -47,6 +47,7 @@ class DAOConflictChecker(mobase.IPluginTool):
         return self.tr(self.DESCRIPTION)
 
     # **Main: Called when plugin selected from tools menu** #
+    @DAOUtils.entry_point
     def display(self):
         game = self._organizer.managedGame()
         if not game.gameShortName() == self.gameName():
@@ -83,6 +84,22 @@ class DAOConflictChecker(mobase.IPluginTool):
                 f"Toggles message logging to console/mo_interface.log.<br>",
                 True,
             ),
+            mobase.PluginSetting(
+                "enable_profiling",
+                (
+                    "Profiles this tool each time it is opened.<br>"
+                    "Saves cProfile stats and top memory allocations to logs/dao_profiles.<br>"
+                ),
+                False,
+            ),
+            mobase.PluginSetting(
+                "stall_threshold_ms",
+                (
+                    "Logs the hot stack frames when this tool blocks MO2 for longer than this (ms).<br>"
+                    "Set to 0 to disable.<br>"
+                ),
+                1000,
+            ),
             mobase.PluginSetting(
                 "font_point_size",
                 f"Set the font size for the conflict checker display.<br>",
@@ -137,6 +154,7 @@ class DAOConflictChecker(mobase.IPluginTool):
     def _set_setting(self, key: str, value: mobase.MoVariant):
         self._organizer.setPluginSetting(self.name(), key, value)
 
+    @DAOUtils.entry_point
     def _handle_plugin_setting_changed(self, plugin: str, setting: str, old: mobase.MoVariant, new: mobase.MoVariant):
         """Event Handler for onPluginSettingChanged"""
         if self.name() != plugin or old == new:
@@ -153,6 +171,7 @@ class DAOConflictChecker(mobase.IPluginTool):
             DAOUtils.log_message(f"Clearing mod ignore list")
             self._ignore_mods.clear()
 
+    @DAOUtils.entry_point
     def _refresh_callback(self):
         """Function to be called on next refresh"""
         self._clear_mod_ignore_list()
@@ -282,7 +301,7 @@ class DAOConflictChecker(mobase.IPluginTool):
                 else:
                     res_path, file = path.rsplit(" -> ", 1)
                     erf = f" -> {file}" if bool(show_full_paths) else ""
-                full_path = self._organizer.resolvePath(f"{conflict_root}{res_path}").casefold()
+                full_path = DAOUtils.resolve_path(self._organizer, f"{conflict_root}{res_path}").casefold()
                 mod_name = self._get_mod_name(full_path)
                 path = full_path if bool(show_full_paths) else path
                 child = QTreeWidgetItem(["", f"{mod_name}", f"{symbol} {path}{erf}"])
@@ -322,7 +341,7 @@ class DAOConflictChecker(mobase.IPluginTool):
             if isRoot and base.casefold() in self._ignore_dirs:
                 continue
             rel_path = entry.pathFrom(conflict_tree, '/').casefold()
-            full_path = self._organizer.resolvePath(f"{conflict_root}{rel_path}").casefold()
+            full_path = DAOUtils.resolve_path(self._organizer, f"{conflict_root}{rel_path}").casefold()
             mod_name = self._get_mod_name(full_path)
             if mod_name in self._ignore_mods:
                 continue
@@ -348,6 +367,7 @@ class DAOConflictChecker(mobase.IPluginTool):
             mod_name = rel_path.split('\\')[0]
         return mod_name
 
+    @DAOUtils.entry_point
     def _set_context_menu(self, point: QPoint):
         """Add right-click menu options"""
         menu = QMenu(self._tree)
@@ -51,6 +51,7 @@ class DAODLCManager(mobase.IPluginTool):
         return self.tr(self.DESCRIPTION)
 
     # **Main: Called when plugin selected from tools menu** #
+    @DAOUtils.entry_point
     def display(self):
         game = self._organizer.managedGame()
         if not game.gameShortName() == self.gameName():
@@ -87,6 +88,22 @@ class DAODLCManager(mobase.IPluginTool):
                 f"Toggles message logging to console/mo_interface.log.<br>",
                 True,
             ),
+            mobase.PluginSetting(
+                "enable_profiling",
+                (
+                    "Profiles this tool each time it is opened.<br>"
+                    "Saves cProfile stats and top memory allocations to logs/dao_profiles.<br>"
+                ),
+                False,
+            ),
+            mobase.PluginSetting(
+                "stall_threshold_ms",
+                (
+                    "Logs the hot stack frames when this tool blocks MO2 for longer than this (ms).<br>"
+                    "Set to 0 to disable.<br>"
+                ),
+                1000,
+            ),
             mobase.PluginSetting(
                 "delete_archives",
                 (
@@ -334,8 +351,16 @@ class DAODLCManager(mobase.IPluginTool):
             paths = self._get_dlc_item_paths(dlc_item)
             yield dlc_item, mod_dir, dirs_dict, paths
 
+    def _clear_manifest_index(self) -> None:
+        """Drop cached manifest paths here and in the game plugin, which has its own copy of the utils"""
+        DAOUtils.clear_manifest_index()
+        clear = getattr(self._organizer.managedGame(), "clear_manifest_index", None)
+        if callable(clear):
+            clear()
+
     def _update_dlc_status(self) -> None:
         """Searches for currently installed DLC"""
+        self._clear_manifest_index()
         for dlc_item, _mod_dir, dirs_dict, paths in self._walk_dlc_item_dirs():        
             for attrib, dir in dirs_dict.items():
                 if not os.path.exists(dir):
@@ -370,6 +395,7 @@ class DAODLCManager(mobase.IPluginTool):
                     file_path = DAOUtils.os_path(dir,path)
                     DAOUtils.remove_file(file_path)
                 dlc_item.set(f"{attrib}_Status", "Missing")
+        self._clear_manifest_index()
         self._organizer.refresh(save_changes=True)
 
     ##############################
@@ -612,11 +638,11 @@ class DAODLCManager(mobase.IPluginTool):
                     continue
                 root.append(new_item)
 
-            xml_str = ET.tostring(root, encoding="unicode")
-            xml_str = xml_str.replace('RequiresAuthorization="1"','RequiresAuthorization="0"')
-            xml_bytes = DAOUtils.pretty_format_xml(xml_str)
+            for elem in root.iter():
+                if elem.get("RequiresAuthorization") == "1":
+                    elem.set("RequiresAuthorization", "0")
             xml_path = DAOUtils.os_path(target_dir, f"{mod_type}.xml")
-            if not DAOUtils.write_file_bytes(xml_path, xml_bytes):
+            if not DAOUtils.write_xml_file(xml_path, root):
                 return False
         return True
 
@@ -625,9 +651,7 @@ class DAODLCManager(mobase.IPluginTool):
         file_paths: list[str] = []
         for current_dir in {self._get_game_dir(), self._get_data_dir()}:
             dir_name = DAOUtils.os_path(current_dir, search_path)
-            temp_paths = DAOUtils.search_dir(dir_name, "Manifest.xml")
-            temp_paths.sort(key = DAOUtils.natural_sort_key)
-            file_paths.extend(temp_paths)
+            file_paths.extend(DAOUtils.search_manifests(dir_name))
         return file_paths
     
     #########################
@@ -670,6 +694,7 @@ class DAODLCManager(mobase.IPluginTool):
         else:
             self._create_dlc_separator()
             self._update_modlist()
+        self._clear_manifest_index()
         self._organizer.refresh(save_changes=True)
         return failures
 
@@ -823,6 +848,7 @@ class DAODLCManager(mobase.IPluginTool):
                 ) 
         except Exception as e:
             DAOUtils.log_message(f"Failed to create meta file {meta_path}: {e}")
+        self._clear_manifest_index()
         self._organizer.refresh(save_changes=True)
         return results
 
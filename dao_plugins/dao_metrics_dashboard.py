@@ -0,0 +1,248 @@
+import json
+import os
+import time
+from typing import Any
+
+from PyQt6.QtCore import QCoreApplication, Qt
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QPushButton,
+    QSizePolicy,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+import mobase
+
+from .dao_utils import DAOUtils
+
+
+class DAOMetricsDashboard(mobase.IPluginTool):
+    #################
+    ## Plugin Meta ##
+    #################
+
+    AUTHOR = "SturdyBuzzer"
+    DESCRIPTION = "Shows runtime metrics collected by the Dragon Age: Origins plugins."
+    DISPLAYNAME = "Dragon Age: Origins - Metrics Dashboard"
+    GAMENAME = "dragonage"
+    ICON_PATH = "plugins/dao_plugins/dao.ico"
+    NAME = "DAO Metrics Dashboard"
+    TOOLTIP = (
+        "Shows file operation counts, cache hit rates and timings<br>"
+        "collected by the Dragon Age: Origins plugins.<br>"
+    )
+    VERSION = "1.0.0"
+    SUPPORTURL = "https://www.nexusmods.com/dragonage/mods/6725"
+
+    ##################################
+    ## IPluginTool Method Overrides ##
+    ##################################
+    def __init__(self):
+        super().__init__()
+
+    def init(self, organizer: mobase.IOrganizer) -> bool:
+        self._organizer = organizer
+        return True
+
+    def author(self) -> str:
+        return self.AUTHOR
+
+    def description(self) -> str:
+        return self.tr(self.DESCRIPTION)
+
+    # **Main: Called when plugin selected from tools menu** #
+    def display(self):
+        game = self._organizer.managedGame()
+        if game.gameShortName() != self.gameName():
+            return
+        self._run_plugin_tool()
+
+    def displayName(self) -> str:
+        return self.tr(self.DISPLAYNAME)
+
+    def gameName(self) -> str:
+        return self.GAMENAME
+
+    def icon(self) -> QIcon:
+        game = self._organizer.managedGame()
+        if game.gameShortName() != self.gameName():
+            return QIcon()
+        return QIcon(self.ICON_PATH)
+
+    def isActive(self) -> bool:
+        game = self._organizer.managedGame()
+        return game.gameShortName() == self.gameName()
+
+    def name(self) -> str:
+        return self.NAME
+
+    # Get main MO2 window (not used) #
+    def setParentWidget(self, parent: QWidget):
+        self._parent_widget = parent
+
+    def settings(self) -> list[mobase.PluginSetting]:
+        return [
+            mobase.PluginSetting(
+                "enable_logging",
+                "Toggles message logging to console/mo_interface.log.<br>",
+                True,
+            ),
+            mobase.PluginSetting(
+                "font_point_size",
+                "Set the font size for the metrics dashboard display.<br>",
+                10,
+            ),
+        ]
+
+    def tooltip(self) -> str:
+        return self.tr(self.TOOLTIP)
+
+    def tr(self, string: str) -> str:
+        return QCoreApplication.translate(self.name(), string)
+
+    def version(self) -> mobase.VersionInfo:
+        major, minor, subminor = map(int, self.VERSION.split("."))
+        return mobase.VersionInfo(major, minor, subminor, mobase.ReleaseType.FINAL)
+
+    ####################
+    ### Helper Utils ###
+    ####################
+    def _get_setting(self, key: str) -> mobase.MoVariant:
+        return self._organizer.pluginSetting(self.name(), key)
+
+    def _set_font_size(self):
+        """Set the display font size"""
+        size = str(self._get_setting("font_point_size"))
+        tree = self._tree
+        font = tree.font()
+        font.setPointSize(int(size))
+        tree.setFont(font)
+
+    ############################################
+    ## Main runners for dao_metrics_dashboard ##
+    ############################################
+    def _run_plugin_tool(self):
+        """Main plugin workflow"""
+        # Init dao_utils for logging
+        DAOUtils.setup_utils(self._organizer, self.name())
+
+        self._metrics_dialog = QDialog()
+        self._show_metrics(self._metrics_dialog)
+
+    def _show_metrics(self, dialog: QDialog):
+        """Display the metrics of each plugin"""
+        dialog.setWindowTitle(self.displayName())
+        dialog.setMinimumSize(720, 405)
+        layout = QVBoxLayout(dialog)
+
+        self._tree = QTreeWidget()
+        tree = self._tree
+        tree.setHeaderLabels(["Metric", "Value", "Mean ms", "Max ms", "Total ms"])
+        tree.setColumnCount(5)
+        tree.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        header = tree.header()
+        if header is not None:
+            header.setMinimumSectionSize(100)
+            header.setSectionResizeMode(0, header.ResizeMode.Stretch)
+        self._set_font_size()
+        self._fill_metrics_tree()
+        layout.addWidget(tree)
+
+        # Buttons
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self._fill_metrics_tree)
+        buttons.addButton(refresh_button, QDialogButtonBox.ButtonRole.ActionRole)
+        reset_button = QPushButton("Reset")
+        reset_button.setToolTip(
+            "Clear the metrics of the tools plugins. Game plugin metrics reset when MO2 restarts."
+        )
+        reset_button.clicked.connect(self._reset_metrics)
+        buttons.addButton(reset_button, QDialogButtonBox.ButtonRole.ActionRole)
+        save_button = QPushButton("Save JSON")
+        save_button.clicked.connect(self._save_metrics)
+        buttons.addButton(save_button, QDialogButtonBox.ButtonRole.ActionRole)
+        buttons.accepted.connect(dialog.accept)
+        layout.addWidget(buttons)
+
+        # Make it a separate window (de-coupled)
+        dialog.setWindowModality(Qt.WindowModality.NonModal)
+        dialog.setWindowFlags(
+            dialog.windowFlags() | Qt.WindowType.WindowMinMaxButtonsHint
+        )
+        dialog.show()
+
+    def _collect_metrics(self) -> dict[str, dict[str, Any]]:
+        """Metrics of this process's DAOUtils plus the dumps written by the other plugins"""
+        own_path = DAOUtils.get_metrics_path().casefold()
+        snapshots = {
+            path: data
+            for path, data in DAOUtils.read_metrics_dumps().items()
+            if path.casefold() != own_path
+        }
+        snapshots[own_path] = DAOUtils.get_metrics()
+        return snapshots
+
+    def _fill_metrics_tree(self):
+        """Fill the tree with a top level item per plugin"""
+        tree = self._tree
+        tree.clear()
+        for data in self._collect_metrics().values():
+            plugin = data.get("plugin") or "Unknown"
+            root = QTreeWidgetItem([plugin, data.get("time", "")])
+            tree.addTopLevelItem(root)
+            counters = QTreeWidgetItem(["Counters"])
+            root.addChild(counters)
+            for name, value in data.get("counters", {}).items():
+                text = (
+                    f"{value / 1048576:.1f} MB"
+                    if name.startswith("bytes.")
+                    else str(value)
+                )
+                counters.addChild(QTreeWidgetItem([name, text]))
+            timings = QTreeWidgetItem(["Timings"])
+            root.addChild(timings)
+            for name, hist in data.get("histograms", {}).items():
+                item = QTreeWidgetItem(
+                    [
+                        name,
+                        str(hist["count"]),
+                        f"{hist['mean_ms']:.2f}",
+                        f"{hist['max_ms']:.2f}",
+                        f"{hist['total_ms']:.0f}",
+                    ]
+                )
+                for label, count in hist["buckets"].items():
+                    item.addChild(QTreeWidgetItem([label, str(count)]))
+                timings.addChild(item)
+            root.setExpanded(True)
+            counters.setExpanded(True)
+            timings.setExpanded(True)
+        tree.resizeColumnToContents(1)
+
+    def _reset_metrics(self):
+        """Clear the metrics of the tools plugins"""
+        DAOUtils.reset_metrics()
+        DAOUtils.dump_metrics()
+        self._fill_metrics_tree()
+
+    def _save_metrics(self):
+        """Save all plugins' metrics to a single JSON snapshot"""
+        snapshot_dir = DAOUtils.os_path(DAOUtils.METRIC_DIR, "snapshots")
+        snapshot_path = DAOUtils.os_path(
+            snapshot_dir, f"metrics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        data = list(self._collect_metrics().values())
+        if not DAOUtils.write_file_bytes(
+            snapshot_path, json.dumps(data, indent=1).encode()
+        ):
+            return
+        DAOUtils.show_message_box(
+            "Metrics Saved",
+            f"Saved metrics snapshot to:<br>{os.path.abspath(snapshot_path)}",
+        )
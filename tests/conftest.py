@@ -0,0 +1,15 @@
+import pytest
+
+
+class _Organizer:
+    def pluginSetting(self, plugin: str, key: str) -> bool:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def no_logging(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Helpers log through the organizer, which only exists inside MO2."""
+    from basic_games.games.dao_game import DAOUtils
+
+    monkeypatch.setattr(DAOUtils, "_organizer", _Organizer(), raising=False)
+    monkeypatch.setattr(DAOUtils, "_plugin_name", "", raising=False)
@@ -0,0 +1,112 @@
+import zipfile
+
+import pytest
+
+pytest.importorskip("mobase")
+
+from basic_games.games.dao_game import DAOInstall, DAOUtils
+
+MOD_PATH = "mods/test"
+
+
+def members(*names: str) -> list[zipfile.ZipInfo]:
+    return [zipfile.ZipInfo(name) for name in names]
+
+
+def plan_names(plan: dict[str, zipfile.ZipInfo]) -> dict[str, str]:
+    return {dst: member.filename for dst, member in plan.items()}
+
+
+def dst(rel_path: str) -> str:
+    return DAOUtils.os_path(MOD_PATH, rel_path)
+
+
+def test_flatten_key_subdir_after_loose() -> None:
+    assert DAOInstall.flatten_key("x.gda") < DAOInstall.flatten_key("a/x.gda")
+    assert DAOInstall.flatten_key("a/x.gda") < DAOInstall.flatten_key("b/x.gda")
+
+
+def test_flatten_key_natural_order() -> None:
+    assert DAOInstall.flatten_key("mod2/x.gda") < DAOInstall.flatten_key("mod10/x.gda")
+    assert DAOInstall.flatten_key("Mod1/x.gda") < DAOInstall.flatten_key("mod2/x.gda")
+
+
+def test_plan_keeps_paths_without_flatten() -> None:
+    plan, keys = DAOInstall.plan_archive_install(
+        members(
+            "Contents/",
+            "Contents/packages/core/override/Sub/x.gda",
+            "contents/addins/a.erf",
+            "manifest.xml",
+        ),
+        "contents/",
+        MOD_PATH,
+        False,
+    )
+    assert plan_names(plan) == {
+        dst(
+            "packages/core/override/Sub/x.gda"
+        ): "Contents/packages/core/override/Sub/x.gda",
+        dst("addins/a.erf"): "contents/addins/a.erf",
+    }
+    assert keys == {}
+
+
+def test_plan_last_member_wins() -> None:
+    plan, _ = DAOInstall.plan_archive_install(
+        members("contents/docs/Readme.txt", "contents/docs/readme.txt"),
+        "contents/",
+        MOD_PATH,
+        False,
+    )
+    assert plan_names(plan) == {dst("docs/readme.txt"): "contents/docs/readme.txt"}
+
+
+def test_plan_drops_unsafe_parts() -> None:
+    plan, _ = DAOInstall.plan_archive_install(
+        members("contents/../../docs/./a.txt", "C:\\contents\\docs\\b.txt"),
+        "contents/",
+        MOD_PATH,
+        False,
+    )
+    assert sorted(plan) == [dst("docs/a.txt"), dst("docs/b.txt")]
+
+
+def test_plan_flattens_override() -> None:
+    ovrd = "contents/packages/core/override"
+    plan, keys = DAOInstall.plan_archive_install(
+        members(
+            f"{ovrd}/mod10/x.gda",
+            f"{ovrd}/x.gda",
+            f"{ovrd}/mod2/x.gda",
+            f"{ovrd}/y.gda",
+        ),
+        "contents/",
+        MOD_PATH,
+        True,
+    )
+    assert plan_names(plan) == {
+        dst("packages/core/override/x.gda"): f"{ovrd}/mod10/x.gda",
+        dst("packages/core/override/y.gda"): f"{ovrd}/y.gda",
+    }
+    assert keys == {
+        dst("packages/core/override/x.gda"): DAOInstall.flatten_key("mod10/x.gda"),
+        dst("packages/core/override/y.gda"): DAOInstall.flatten_key("y.gda"),
+    }
+
+
+def test_plan_keeps_override_config_dir() -> None:
+    plan, keys = DAOInstall.plan_archive_install(
+        members(
+            "bioware/dragon age/packages/core/override/pkg/OverrideConfig.xml",
+            "bioware/dragon age/packages/core/override/pkg/a.mmh",
+        ),
+        "bioware/dragon age/",
+        MOD_PATH,
+        True,
+    )
+    assert sorted(plan) == [
+        dst("packages/core/override/a.mmh"),
+        dst("packages/core/override/pkg/OverrideConfig.xml"),
+    ]
+    assert list(keys) == [dst("packages/core/override/a.mmh")]
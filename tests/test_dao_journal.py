@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mobase")
+
+from basic_games.games.dao_game import DAOLaunch, DAOUtils
+
+
+def test_journal_round_trip(tmp_path: Path) -> None:
+    journal = str(tmp_path / "journal.txt")
+    assert DAOUtils.write_journal(journal, [["S", "1", "app.exe"]])
+    assert DAOUtils.append_journal(journal, [["B", "bin_ship", "a.dll"], ["E"]])
+    assert DAOUtils.read_journal(journal) == [
+        ["S", "1", "app.exe"],
+        ["B", "bin_ship", "a.dll"],
+        ["E"],
+    ]
+
+
+def test_journal_write_replaces(tmp_path: Path) -> None:
+    journal = str(tmp_path / "journal.txt")
+    DAOUtils.write_journal(journal, [["S", "1", "old.exe"], ["E"]])
+    DAOUtils.write_journal(journal, [["S", "2", "new.exe"]])
+    assert DAOUtils.read_journal(journal) == [["S", "2", "new.exe"]]
+    assert not (tmp_path / "journal.txt.mo2tmp").exists()
+
+
+def test_journal_skips_torn_line(tmp_path: Path) -> None:
+    journal = tmp_path / "journal.txt"
+    journal.write_text("S\t1\tapp.exe\nD\tbin_ship\ta.d", encoding="utf-8")
+    assert DAOUtils.read_journal(str(journal)) == [["S", "1", "app.exe"]]
+
+
+def test_journal_missing(tmp_path: Path) -> None:
+    assert DAOUtils.read_journal(str(tmp_path / "missing.txt")) == []
+
+
+@pytest.fixture
+def journal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    path = str(tmp_path / "journal.txt")
+    monkeypatch.setattr(DAOLaunch, "_get_journal_path", staticmethod(lambda: path))
+    return path
+
+
+def deploy_entry(path: str, src: str) -> dict[str, str]:
+    return {
+        "path": path,
+        "src": src,
+        "size": "10",
+        "mtime": "20",
+        "hash": "abc",
+        "backup": "0",
+    }
+
+
+def test_replay_open_session(journal: str) -> None:
+    entry = deploy_entry("DAFix.dll", "mods/fix/bin_ship/DAFix.dll")
+    DAOUtils.write_journal(
+        journal,
+        [
+            ["S", "100", "DAOrigins.exe"],
+            DAOLaunch._deploy_record("bin_ship", {"path": "Game.ini", "backup": "1"}),
+            DAOLaunch._deploy_record("bin_ship", entry),
+        ],
+    )
+    state = DAOLaunch._replay_journal()
+    assert state["open"]
+    assert state["app_path"] == "DAOrigins.exe"
+    assert state["start"] == 100
+    assert state["deployed"] == {
+        "bin_ship": {
+            "game.ini": {"path": "Game.ini", "backup": "1"},
+            "dafix.dll": entry,
+        }
+    }
+    assert state["restored"] == {}
+
+
+def test_replay_restore_and_close(journal: str) -> None:
+    DAOUtils.write_journal(
+        journal,
+        [
+            ["S", "100", "DAOrigins.exe"],
+            ["R", "bin_ship", "Old.dll"],
+            ["E"],
+            ["S", "200", "DAOrigins.exe"],
+            ["D", "bin_ship", "A.dll", "src/A.dll", "1", "2", "h", "0"],
+            ["D", "bin_ship", "B.dll", "src/B.dll", "1", "2", "h", "0"],
+            ["R", "bin_ship", "a.DLL"],
+            ["E"],
+        ],
+    )
+    state = DAOLaunch._replay_journal()
+    assert not state["open"]
+    assert state["start"] == 200
+    assert list(state["deployed"]["bin_ship"]) == ["b.dll"]
+    # Restores of an earlier session are dropped when a new one starts
+    assert state["restored"] == {"bin_ship": {DAOUtils.os_path_casefold("a.DLL")}}
+
+
+def test_replay_skips_invalid_records(journal: str) -> None:
+    DAOUtils.write_journal(
+        journal,
+        [["S", "x", "DAOrigins.exe"], ["D", "bin_ship", "A.dll"], ["Q"]],
+    )
+    state = DAOLaunch._replay_journal()
+    assert not state["open"]
+    assert state["deployed"] == {}
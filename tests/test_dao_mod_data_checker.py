@@ -0,0 +1,104 @@
+from collections.abc import Iterator
+
+import pytest
+
+pytest.importorskip("mobase")
+
+from basic_games.games.dao_game import DAOModDataChecker
+
+
+class FakeFile:
+    """File entry of a flat fake tree, holding its full '/' separated path."""
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def isDir(self) -> bool:
+        return False
+
+    def name(self) -> str:
+        return self._path.rpartition("/")[2]
+
+    def suffix(self) -> str:
+        name = self.name()
+        return name.rpartition(".")[2] if "." in name else ""
+
+    def pathFrom(self, tree: "FakeTree", separator: str = "\\") -> str:
+        return self._path.replace("/", separator)
+
+
+class FakeTree:
+    def __init__(self, name: str, *paths: str):
+        self._name = name
+        self.files = {path: FakeFile(path) for path in paths}
+
+    def name(self) -> str:
+        return self._name
+
+    def __iter__(self) -> Iterator[FakeFile]:
+        return iter(self.files.values())
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> dict[str, bool]:
+    values = {"duplicate_warning": False, "flatten_override": False}
+    monkeypatch.setattr(
+        DAOModDataChecker, "get_setting", staticmethod(lambda key: values[key])
+    )
+    return values
+
+
+def test_classify_download(settings: dict[str, bool]) -> None:
+    tree = FakeTree(
+        "",
+        "Mod.dazip",
+        "DAFix.dll",
+        "readme.txt",
+        "packages/core/override/x.gda",
+        "textures/x.gda",
+    )
+    result = DAOModDataChecker.classify(tree)
+    assert result["fixable"]
+    assert result["fix_queue"] == {
+        "bin_ship/DAFix.dll": tree.files["DAFix.dll"],
+        "Mod.dazip.mo2unpack": tree.files["Mod.dazip"],
+        "docs/readme.txt": tree.files["readme.txt"],
+        "packages/core/override/textures/x.gda": tree.files["textures/x.gda"],
+    }
+    assert result["duplicates"] == {
+        "x.gda": ["packages/core/override/x.gda", "textures/x.gda"]
+    }
+    assert result["ovrd_duplicates"] == {"x.gda": ["x.gda", "textures/x.gda"]}
+    assert not result["duplicate_warning"]
+    assert not result["flatten"]
+
+
+def test_classify_installed(settings: dict[str, bool]) -> None:
+    tree = FakeTree(
+        "mod",
+        "bin_ship/DAFix.dll",
+        "docs/readme.txt",
+        "packages/core/override/sub/x.gda",
+    )
+    result = DAOModDataChecker.classify(tree)
+    assert not result["fixable"]
+    # Files already in place are queued onto their own path
+    assert result["fix_queue"] == {
+        "bin_ship/DAFix.dll": tree.files["bin_ship/DAFix.dll"],
+        "docs/readme.txt": tree.files["docs/readme.txt"],
+    }
+    settings["flatten_override"] = True
+    assert DAOModDataChecker.classify(tree)["fixable"]
+
+
+def test_classify_duplicate_warning(settings: dict[str, bool]) -> None:
+    tree = FakeTree(
+        "",
+        "packages/core/override/sub/X.gda",
+        "packages/core/override/x.gda",
+    )
+    assert not DAOModDataChecker.classify(tree)["fixable"]
+    settings["duplicate_warning"] = True
+    result = DAOModDataChecker.classify(tree)
+    assert result["fixable"]
+    assert result["ovrd_duplicates"] == {"x.gda": ["x.gda", "sub/x.gda"]}
@@ -0,0 +1,75 @@
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pytest
+
+pytest.importorskip("mobase")
+
+from basic_games.games.dao_game import DAOUtils
+
+HEADER = b'<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n'
+
+
+def addins_tree() -> ET.Element:
+    root = ET.Element("AddInsList")
+    root.append(ET.Comment(" Built by MO2 "))
+    item = ET.SubElement(
+        root, "AddInItem", {"UID": "mod_1", "Name": 'Tom & "Jerry" <3>'}
+    )
+    title = ET.SubElement(item, "Title")
+    ET.SubElement(title, "LocalizedString", {"Lang": "en"}).text = "Café > Bar"
+    ET.SubElement(item, "Empty")
+    ET.SubElement(item, "Blank").text = "\n   "
+    mixed = ET.SubElement(root, "Mixed")
+    mixed.text = "head"
+    ET.SubElement(mixed, "b").tail = "tail"
+    root.append(ET.ProcessingInstruction("target", "data here"))
+    return root
+
+
+def test_write_xml_file_bytes(tmp_path: Path) -> None:
+    xml_path = tmp_path / "Addins.xml"
+    assert DAOUtils.write_xml_file(str(xml_path), addins_tree())
+    assert (
+        xml_path.read_bytes()
+        == HEADER
+        + (
+            "<AddInsList>\n"
+            "  <!-- Built by MO2 -->\n"
+            '  <AddInItem UID="mod_1" Name="Tom &amp; &quot;Jerry&quot; &lt;3&gt;">\n'
+            "    <Title>\n"
+            '      <LocalizedString Lang="en">Café &gt; Bar</LocalizedString>\n'
+            "    </Title>\n"
+            "    <Empty/>\n"
+            "    <Blank/>\n"
+            "  </AddInItem>\n"
+            "  <Mixed>\n"
+            "    head\n"
+            "    <b/>\n"
+            "    tail\n"
+            "  </Mixed>\n"
+            "  <?target data here?>\n"
+            "</AddInsList>\n"
+        ).encode()
+    )
+    assert not (tmp_path / "Addins.xml.mo2tmp").exists()
+
+
+def test_write_xml_file_indent(tmp_path: Path) -> None:
+    root = ET.Element("Root")
+    ET.SubElement(ET.SubElement(root, "A"), "B").text = "1"
+    xml_path = tmp_path / "sub" / "Root.xml"
+    assert DAOUtils.write_xml_file(str(xml_path), root, "\t")
+    assert (
+        xml_path.read_bytes()
+        == HEADER + b"<Root>\n\t<A>\n\t\t<B>1</B>\n\t</A>\n</Root>\n"
+    )
+
+
+def test_write_xml_file_round_trip(tmp_path: Path) -> None:
+    xml_path = tmp_path / "Addins.xml"
+    DAOUtils.write_xml_file(str(xml_path), addins_tree())
+    item = ET.parse(xml_path).getroot().find("AddInItem")
+    assert item is not None
+    assert item.get("Name") == 'Tom & "Jerry" <3>'
+    assert item.findtext("Title/LocalizedString") == "Café > Bar"